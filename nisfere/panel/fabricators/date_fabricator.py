@@ -1,6 +0,0 @@
-from fabric.core import Fabricator
-import time
-
-date_fabricator = Fabricator(
-    poll_from= lambda _: time
-)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import setproctitle
 import re
+import signal
 from loguru import logger
 from fabric import Application
 from fabric.utils import get_relative_path, monitor_file, exec_shell_command
@@ -8,6 +9,9 @@ from modules.notification import Notifications
 from modules.dock import Dock
 from modules.launcher import Launcher
 from utils.config import CONFIG_FILE_PATH, CONFIG, fabric_config
+from services import notification_service
+
+from gi.repository import GLib
 
 
 def apply_style(app: Application):
@@ -64,6 +68,16 @@ if __name__ == "__main__":
         ),
     )
 
+    def on_quit_signal():
+        # killall (init-panel.sh) sends SIGTERM, save the notifications first
+        notification_service.close()
+        app.quit()
+        return GLib.SOURCE_REMOVE
+
+    for quit_signal in (signal.SIGTERM, signal.SIGINT):
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, quit_signal, on_quit_signal)
+
     apply_style(app)
     # Run the application
     app.run()
+    notification_service.close()
@@ -6,7 +6,7 @@ from gi.repository import Gdk
 from fabric.widgets.label import Label
 from fabric.widgets.widget import Widget
 
-from fabricators.date_fabricator import date_fabricator
+from services import system_metrics_service
 from shared import ButtonWithIcon, PopOverWindow
 from utils.config import CONFIG
 from utils.icons import clock as date_time_icon
@@ -44,23 +44,21 @@ class DateTime(ButtonWithIcon):
 
         self.set_text(self.do_format())
 
-        date_fabricator.build().connect("changed", lambda _,
-                                        v: self.do_update_label(v)).unwrap()
+        system_metrics_service.watch("time", self, self.do_update_label)
 
         self.connect(
             "clicked", lambda *args: self.popup.set_visible(not self.popup.get_visible()))
 
         self.connect("scroll-event", self.do_handle_scroll)
 
-    def do_format(self, updated_time=time) -> str:
-        return updated_time.strftime(self.formatters[self.current_index])
+    def do_format(self, updated_time: time.struct_time | None = None) -> str:
+        return time.strftime(self.formatters[self.current_index], updated_time or time.localtime())
 
     def do_check_invalid_index(self, index: int) -> bool:
         return (index < 0) or (index > (len(self.formatters) - 1))
 
-    def do_update_label(self, updated_time=time):
+    def do_update_label(self, updated_time: time.struct_time | None = None):
         self.set_text(self.do_format(updated_time))
-        self.calendar.update_clock_label(updated_time)
 
     def do_handle_press(self):
         self.calendar.set_visible(not self.calendar.get_visible())
@@ -1,7 +1,7 @@
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 
-from services import  MediaPlayerService, MediaManager
+from services import media_manager_service
 from shared import Button, ScrollingLabel
 from utils.helpers import get_media_player_icon
 from utils.icons import media_player_icons, media_player_player_icons
@@ -13,12 +13,13 @@ class MediaPlayer(Button):
 
         self.bar = bar
 
-        self.media_manager = MediaManager().build()\
+        self.media_manager = media_manager_service.build()\
             .connect("notify::current-player", self.on_current_player_changed)\
         .unwrap()
-        
-        self.media_player = self.media_manager.current_player
 
+        self.media_player = None
+
+        # built on first use, then rebound whenever the current player changes
         self.media_menu = None
 
         self.icon = Label(label= media_player_player_icons['default'])
@@ -39,20 +40,20 @@ class MediaPlayer(Button):
             )
         )
 
-        self.media_manager.notify('current-player')
+        self.on_current_player_changed()
 
     def on_current_player_changed(self, *_):
         """Called when the media player changes."""
-        if self.media_manager.current_player:
-            self.media_player = self.media_manager.current_player
+        if self.media_player:
+            self.media_player.disconnect_by_func(self.update_widget)
+
+        self.media_player = self.media_manager.current_player
+        if self.media_player:
             self.media_player.connect("notify::track", self.update_widget)
-        else:
-            if self.media_player:
-                self.media_player.disconnect_by_func(self.update_widget)
-            self.media_player = None
 
         self.update_widget()
-        self.update_media_menu()
+        if self.media_menu:
+            self.media_menu.bind(self.media_player)
 
     def update_widget(self, *_):
         """Update the media player icon and track name."""
@@ -66,22 +67,10 @@ class MediaPlayer(Button):
         self.icon.set_label(icon)
         self.label.set_scroll_label(track)
 
-    def update_media_menu(self):
-        if self.media_player:
-            if not self.media_menu:
-                self.media_menu = self.create_media_menu()
-            else:
-                self.media_menu.on_exit()
-                self.media_menu = self.create_media_menu()
-        else:
-            if self.media_menu : self.media_menu = None
-
     def toggle_menu(self, *_):
         """Toggle the media player menu visibility."""
-        if not self.media_menu:
+        if not self.media_player:
             return  # No active player, do nothing
+        if not self.media_menu:
+            self.media_menu = MediaPlayerMenu(media_player= self.media_player, pointing_to= self, parent= self.bar)
         self.media_menu.set_visible(not self.media_menu.get_visible())
-
-    def create_media_menu(self):
-        return MediaPlayerMenu(media_player= self.media_player, pointing_to= self, parent= self.bar)
-
@@ -2,9 +2,9 @@ from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.image import Image
 from fabric.widgets.wayland import WaylandWindow as Window
-from fabric.utils.helpers import exec_shell_command_async, truncate
+from fabric.utils.helpers import truncate
 
-from services import hyprland_clients_service, HyprlandClient
+from services import hyprland_clients_service, hyprland_dispatcher_service, HyprlandClient
 from shared import Button, PopOverWindow
 from utils.config import CONFIG
 from utils.icons import close as close_icon
@@ -164,7 +164,7 @@ class PinnedDockButton(BaseDockButton):
     def __init__(self, app: str, **kwargs):
         super().__init__(icon_name=app, **kwargs)
         self.app = app
-        self.button.connect("clicked", lambda *args: exec_shell_command_async(f"hyprctl dispatch exec {self.app}"))
+        self.button.connect("clicked", lambda *args: hyprland_dispatcher_service.dispatch("exec", self.app))
 
 class DockButton(BaseDockButton):
     def __init__(self, app: str, dock: Dock, **kwargs):
@@ -190,7 +190,7 @@ class DockButton(BaseDockButton):
 
     def on_clicked(self):
         if len(self.clients) == 1:
-            exec_shell_command_async(f"hyprctl dispatch focuswindow address:{self.clients[0].address}")
+            hyprland_dispatcher_service.dispatch("focuswindow", f"address:{self.clients[0].address}")
             self.dock.close_popup()
         else:
             self.dock.show_popup(app=self.class_name, clients=self.clients)
@@ -276,5 +276,5 @@ class DockPopup(PopOverWindow):
                 child.destroy()
 
     def focus_client(self, client: HyprlandClient):
-        exec_shell_command_async(f"hyprctl dispatch focuswindow address:{client.address}")
+        hyprland_dispatcher_service.dispatch("focuswindow", f"address:{client.address}")
         self._parent.close_popup()
\ No newline at end of file
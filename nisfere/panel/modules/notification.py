@@ -1,3 +1,4 @@
+from collections import deque
 from typing import cast
 
 from fabric.widgets.box import Box
@@ -7,7 +8,24 @@ from fabric.widgets.wayland import WaylandWindow
 from services import notification_service, Notification
 from widgets import NotificationWidget
 
+from gi.repository import GLib
+
+MAX_POPUPS = 3  # popups on screen at once
+MAX_PENDING = 10  # popups waiting for a free slot, older ones are dropped
+
+
 class Notifications(WaylandWindow):
+    """The popup stack.
+
+    Incoming notifications are collected and handled once per main loop
+    iteration, so a flood costs one pass instead of one per notification.
+    A notification with the same app and summary as a popup already on
+    screen is stacked onto it (the popup shows a counter) instead of getting
+    a popup of its own. At most `MAX_POPUPS` are shown, the rest wait for a
+    free slot, unless they are closed meanwhile; they stay in the
+    notification history either way.
+    """
+
     def __init__(self, **kwargs):
         super().__init__(
             name="notifications",
@@ -24,8 +42,13 @@ class Notifications(WaylandWindow):
             .connect('notification-added', self.on_notification_added)\
             .unwrap()
 
+        self._incoming: list[int] = []
+        self._pending: deque[Notification] = deque()
+        self._pending_handlers: dict[Notification, int] = {}
+        self._popups: dict[tuple[str, str], NotificationWidget] = {}
+
         self.inner_box =  Box(
-            size=1, 
+            size=1,
             spacing=4,
             orientation="v",
         )
@@ -35,11 +58,69 @@ class Notifications(WaylandWindow):
         self.show_all()
 
     def on_notification_added(self, _, nid):
-        self.inner_box.add(
-            NotificationWidget(
-                cast(
-                    Notification,
-                    self.notifs_service.get_notification_from_id(nid),
-                )
-            )
-        )
\ No newline at end of file
+        if not self._incoming:
+            GLib.idle_add(self.process_incoming)
+        self._incoming.append(nid)
+
+    def process_incoming(self):
+        incoming, self._incoming = self._incoming, []
+        for nid in incoming:
+            notification = self.notifs_service.get_notification_from_id(nid)
+            if notification:
+                self.show_notification(cast(Notification, notification))
+        return False
+
+    def show_notification(self, notification: Notification):
+        key = self.get_key(notification)
+
+        if popup := self._popups.get(key):
+            popup.stack(notification)
+            return
+
+        for index, pending in enumerate(self._pending):
+            if self.get_key(pending) == key:
+                # only the newest of a waiting burst is worth showing
+                self._pending[index] = notification
+                self.watch_pending(notification)
+                self.unwatch_pending(pending)
+                pending.close("expired")
+                return
+
+        if len(self._popups) >= MAX_POPUPS:
+            self._pending.append(notification)
+            self.watch_pending(notification)
+            if len(self._pending) > MAX_PENDING:
+                dropped = self._pending.popleft()
+                self.unwatch_pending(dropped)
+                dropped.close("expired")
+            return
+
+        popup = NotificationWidget(notification)
+        popup.connect("destroy", lambda *_: self.on_popup_closed(key, popup))
+        self._popups[key] = popup
+        self.inner_box.add(popup)
+
+    def on_popup_closed(self, key: tuple[str, str], popup: NotificationWidget):
+        if self._popups.get(key) is popup:
+            del self._popups[key]
+        if self._pending and len(self._popups) < MAX_POPUPS:
+            notification = self._pending.popleft()
+            self.unwatch_pending(notification)
+            self.show_notification(notification)
+
+    def watch_pending(self, notification: Notification):
+        self._pending_handlers[notification] = notification.connect(
+            "closed", lambda *_: self.on_pending_closed(notification))
+
+    def unwatch_pending(self, notification: Notification):
+        if (handler := self._pending_handlers.pop(notification, None)) is not None:
+            notification.disconnect(handler)
+
+    def on_pending_closed(self, notification: Notification):
+        # closed by its app (or expired) before a slot freed up
+        self.unwatch_pending(notification)
+        self._pending.remove(notification)
+
+    @staticmethod
+    def get_key(notification: Notification) -> tuple[str, str]:
+        return (notification.app_name, notification.summary)
@@ -36,6 +36,10 @@ class SidePanel(PopOverWindow):
         self.folder_box = Folders()
         
         self.progress_bars_container = ProgressBarsContainer()
+
+        self.metrics_graphs = MetricsGraphs()
+
+        self.process_list = ProcessList()
         
         self.children = Box(
             name="side-panel-box",
@@ -43,5 +47,5 @@ class SidePanel(PopOverWindow):
             size=(250),
             orientation="v",
             spacing=8,
-            children=[self.user_header, self.user_details_box, self.apps_box, self.folder_box, self.progress_bars_container],
+            children=[self.user_header, self.user_details_box, self.apps_box, self.folder_box, self.progress_bars_container, self.metrics_graphs, self.process_list],
         )
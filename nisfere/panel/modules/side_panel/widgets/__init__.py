@@ -3,5 +3,7 @@ from modules.side_panel.widgets.folders import Folders
 from modules.side_panel.widgets.power_buttons import PowerButtons
 from modules.side_panel.widgets.launcher_apps import LauncherApps
 from modules.side_panel.widgets.progress_bars_container import ProgressBarsContainer
+from modules.side_panel.widgets.metrics_graphs import MetricsGraphs
+from modules.side_panel.widgets.process_list import ProcessList
 from modules.side_panel.widgets.user_details import UserDetails
 from modules.side_panel.widgets.user_header import UserHeader
\ No newline at end of file
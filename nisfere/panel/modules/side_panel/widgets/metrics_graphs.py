@@ -0,0 +1,113 @@
+from fabric.widgets.box import Box
+from fabric.widgets.label import Label
+
+from services import metrics_history_service
+from shared import Button, Sparkline
+from utils.helpers import format_rate, format_duration
+from utils.icons import (
+    ram as ram_icon,
+    cpu as cpu_icon,
+    disk as disk_icon,
+    download as download_icon,
+    upload as upload_icon,
+)
+
+# (icon, series, max value) of each graph
+GRAPHS = [
+    (cpu_icon, "cpu", 100),
+    (ram_icon, "memory", 100),
+    (disk_icon, "disk-read", None),
+    (download_icon, "net-rx", None),
+]
+
+
+class MetricsGraphs(Box):
+    """Sparklines of the recent CPU, memory, disk and network history.
+
+    The header cycles through the history tiers (minutes, then hours).
+    History is recorded, and graphs redrawn, while the side panel is open.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            style_classes="side-panel-widget",
+            name="metrics-graphs",
+            orientation="v",
+            spacing=6,
+            **kwargs
+        )
+
+        self.tier = 0
+
+        self.tier_button = Button(
+            name="metrics-graphs-tier",
+            h_align="end",
+            on_clicked=lambda *_: self.cycle_tier(),
+        )
+
+        self.sparklines: dict[str, Sparkline] = {}
+        self.value_labels: dict[str, Label] = {}
+
+        self.add(self.tier_button)
+        for icon, series, max_value in GRAPHS:
+            self.sparklines[series] = Sparkline(
+                series=metrics_history_service.get_series(series),
+                max_value=max_value,
+                style_classes="metrics-graph",
+                h_expand=True,
+            )
+            self.value_labels[series] = Label(
+                style_classes="metrics-graph-value", h_align="end")
+            self.add(
+                Box(
+                    orientation="h",
+                    spacing=8,
+                    children=[
+                        Label(label=icon, style_classes="metrics-graph-icon"),
+                        self.sparklines[series],
+                        self.value_labels[series],
+                    ],
+                )
+            )
+
+        metrics_history_service.connect("updated", self.on_history_updated)
+        metrics_history_service.watch(self)
+        self.connect("map", self.on_history_updated)
+
+    def on_history_updated(self, *_):
+        if not self.get_mapped():
+            return
+
+        for series_name, sparkline in self.sparklines.items():
+            sparkline.set_series(metrics_history_service.get_series(series_name))
+        self.update_tier_label()
+
+        self.set_value("cpu", "{:.0f}%")
+        self.set_value("memory", "{:.0f}%")
+        self.set_rates("disk-read", "disk-read", "disk-write", "R", "W")
+        self.set_rates("net-rx", "net-rx", "net-tx", download_icon, upload_icon)
+
+    def set_value(self, series_name: str, template: str):
+        if series := metrics_history_service.get_series(series_name):
+            self.value_labels[series_name].set_label(template.format(series.latest()))
+
+    def set_rates(self, label: str, first: str, second: str, first_prefix: str, second_prefix: str):
+        first_series = metrics_history_service.get_series(first)
+        second_series = metrics_history_service.get_series(second)
+        if first_series and second_series:
+            self.value_labels[label].set_label(
+                f"{first_prefix} {format_rate(first_series.latest())}\n"
+                f"{second_prefix} {format_rate(second_series.latest())}")
+
+    def cycle_tier(self):
+        series = metrics_history_service.get_series("cpu")
+        tiers = series.tiers if series else 1
+        self.tier = (self.tier + 1) % tiers
+        for sparkline in self.sparklines.values():
+            sparkline.set_tier(self.tier)
+        self.update_tier_label()
+
+    def update_tier_label(self):
+        series = metrics_history_service.get_series("cpu")
+        span = series.tier_span(self.tier) if series else 0
+        self.tier_button.set_label(format_duration(span) if span else "")
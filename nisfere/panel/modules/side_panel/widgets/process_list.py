@@ -0,0 +1,108 @@
+from fabric.widgets.box import Box
+from fabric.widgets.label import Label
+
+from services import system_metrics_service
+from shared import Button
+from utils.helpers import format_rate, format_size
+from utils.icons import (
+    ram as ram_icon,
+    cpu as cpu_icon,
+)
+
+ROWS = 5
+
+
+class ProcessRow(Box):
+    def __init__(self, **kwargs):
+        super().__init__(
+            style_classes="process-row",
+            orientation="h",
+            spacing=6,
+            **kwargs
+        )
+
+        self.name_label = Label(
+            style_classes="process-name",
+            h_align="start",
+            h_expand=True,
+            ellipsization="end",
+            max_chars_width=14,
+        )
+        self.cpu_label = Label(style_classes="process-value", h_align="end")
+        self.memory_label = Label(style_classes="process-value", h_align="end")
+        self.io_label = Label(style_classes="process-value", h_align="end")
+
+        self.children = [self.name_label, self.cpu_label, self.memory_label, self.io_label]
+
+    def set_process(self, process):
+        self.name_label.set_label(process.name)
+        self.set_tooltip_text(f"{process.pid}  {process.command}")
+        self.cpu_label.set_label(f"{process.cpu:.0f}%")
+        self.memory_label.set_label(format_size(process.rss))
+        self.io_label.set_label(format_rate(process.io))
+
+
+class ProcessList(Box):
+    """The processes using the most CPU or memory.
+
+    Rows are created once and relabelled on each sample, which only arrives
+    while the list is on screen.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            style_classes="side-panel-widget",
+            name="process-list",
+            orientation="v",
+            spacing=4,
+            **kwargs
+        )
+
+        self.sort_by = "cpu"
+        self.processes = None
+
+        self.sort_buttons = {
+            "cpu": Button(
+                label=cpu_icon,
+                style_classes="process-sort",
+                on_clicked=lambda *_: self.set_sort("cpu"),
+            ),
+            "memory": Button(
+                label=ram_icon,
+                style_classes="process-sort",
+                on_clicked=lambda *_: self.set_sort("memory"),
+            ),
+        }
+        self.rows = [ProcessRow() for _ in range(ROWS)]
+
+        self.add(Box(orientation="h", spacing=4, h_align="end", children=list(self.sort_buttons.values())))
+        for row in self.rows:
+            self.add(row)
+
+        self.update_sort_buttons()
+        system_metrics_service.watch("processes", self, self.on_processes)
+
+    def set_sort(self, sort_by: str):
+        self.sort_by = sort_by
+        self.update_sort_buttons()
+        self.update_rows()
+
+    def update_sort_buttons(self):
+        for sort_by, button in self.sort_buttons.items():
+            if sort_by == self.sort_by:
+                button.add_style_class("active")
+            else:
+                button.remove_style_class("active")
+
+    def on_processes(self, processes):
+        self.processes = processes
+        self.update_rows()
+
+    def update_rows(self):
+        processes = self.processes[self.sort_by] if self.processes else []
+        for index, row in enumerate(self.rows):
+            if index < len(processes):
+                row.set_process(processes[index])
+                row.show()
+            else:
+                row.hide()
@@ -6,7 +6,7 @@ from utils.icons import (
     cpu as cpu_icon,
     disk as disk_icon
 )
-from fabricators.psutil_fabricator import psutil_fabricator
+from services import system_metrics_service
 
 
 class ProgressBarsContainer(Box):
@@ -17,10 +17,6 @@ class ProgressBarsContainer(Box):
             **kwargs
         )
 
-        psutil_fabricator.build()\
-            .connect("changed", lambda _, v: self.on_psutil_value_changed(v))\
-            .unwrap()
-
         self.cpu_progress_bar_with_icon = ProgressBarWithIcon(
             progress_bar_name="cpu-progress-bar",
             icon=cpu_icon,
@@ -56,10 +52,9 @@ class ProgressBarsContainer(Box):
             )
         )
 
-    def on_psutil_value_changed(self, psutil_value):
-        self.cpu_progress_bar_with_icon.set_progress_bar_value(
-            psutil_value["cpu_usage"])
-        self.ram_progress_bar_with_icon.set_progress_bar_value(
-            psutil_value["ram_usage"])
-        self.disk_progress_bar_with_icon.set_progress_bar_value(
-            psutil_value["disk_usage"])
+        system_metrics_service.watch(
+            "cpu", self, self.cpu_progress_bar_with_icon.set_progress_bar_value)
+        system_metrics_service.watch(
+            "memory", self, self.ram_progress_bar_with_icon.set_progress_bar_value)
+        system_metrics_service.watch(
+            "disk", self, self.disk_progress_bar_with_icon.set_progress_bar_value)
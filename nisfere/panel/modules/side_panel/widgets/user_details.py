@@ -3,9 +3,8 @@ from fabric.widgets.image import Image
 from fabric.widgets.label import Label
 from fabric.widgets.datetime import DateTime
 
-from utils.helpers import get_profile_picture_path, get_current_uptime
-
-from fabricators.uptime_fabricator import uptime_fabricator
+from services import system_metrics_service
+from utils.helpers import get_profile_picture_path, get_current_uptime, format_uptime
 
 class UserDetails(Box):
     def __init__(self, **kwargs):
@@ -21,12 +20,10 @@ class UserDetails(Box):
             style_classes = "profile-pic"
         )
 
-        uptime_fabricator.build()\
-            .connect("changed", lambda _, v: self.on_uptime_value_changed(v))\
-            .unwrap()
-
         self.uptime_label = Label(label = f"{get_current_uptime()}", name = "user-uptime-label")
 
+        system_metrics_service.watch("uptime", self, self.on_uptime_value_changed)
+
         self.children = [
             self.profile_pic,
             Box(
@@ -42,5 +39,5 @@ class UserDetails(Box):
         
 
     def on_uptime_value_changed(self, uptime_value):
-        self.uptime_label.set_label(uptime_value)
+        self.uptime_label.set_label(format_uptime(uptime_value))
     
\ No newline at end of file
@@ -1,27 +1,41 @@
 from services.media_player import MediaPlayer as MediaPlayerService, MediaManager
+from services.hyprland_ipc import HyprlandIPC, HyprlandRequest
+from services.hyprland_dispatcher import HyprlandDispatcher
 from services.hyprland_language import HyprlandLanguage
 from services.notifications import Notifications,  Notification, CachedNotification, CachedNotifications
 from services.hyprland_clients import HyprlandClients, HyprlandClient
 from services.screenshot import Screenshot
 from services.screen_recorder import ScreenRecorder
-from services.network_manager import NetworkClient, Wifi, Ethernet, AccessPoint
+from services.network_manager import NetworkClient, NetworkRates, Wifi, Ethernet, AccessPoint
 from services.battery import Battery
 from services.brightness import Brightness
 from services.theme_switcher import ThemeSwitcher
+from services.desktop_apps import DesktopApps, CachedDesktopApp
+from services.launch_history import LaunchHistory
+from services.system_metrics import SystemMetrics
+from services.metrics_history import MetricsHistory
 from fabric.audio import Audio
+from utils.config import CONFIG
 from fabric.bluetooth import BluetoothClient
 
 notification_service = CachedNotifications()
 
-hyprland_language_service = HyprlandLanguage()
+hyprland_ipc_service = HyprlandIPC()
 
-hyprland_clients_service = HyprlandClients()
+hyprland_dispatcher_service = HyprlandDispatcher(ipc=hyprland_ipc_service)
+
+hyprland_language_service = HyprlandLanguage(
+    ipc=hyprland_ipc_service, dispatcher=hyprland_dispatcher_service)
+
+hyprland_clients_service = HyprlandClients(ipc=hyprland_ipc_service)
 
 audio_service = Audio()
 
+media_manager_service = MediaManager()
+
 network_manager_service = NetworkClient()
 
-screenshot_service = Screenshot()
+screenshot_service = Screenshot(ipc=hyprland_ipc_service)
 
 screen_recorder_service = ScreenRecorder()
 
@@ -31,4 +45,15 @@ brightness_service = Brightness()
 
 bluetooth_service = BluetoothClient()
 
-theme_switcher_service = ThemeSwitcher()
\ No newline at end of file
+theme_switcher_service = ThemeSwitcher()
+
+desktop_apps_service = DesktopApps(icon_size=24)
+
+launch_history_service = LaunchHistory()
+
+system_metrics_service = SystemMetrics()
+
+metrics_history_service = MetricsHistory(
+    metrics=system_metrics_service, **CONFIG["metrics-history"])
+
+network_rates_service = NetworkRates(metrics=system_metrics_service)
@@ -0,0 +1,275 @@
+import os
+import json
+import math
+from typing import Optional
+from loguru import logger
+
+from fabric.core.service import Service, Signal, Property
+from fabric.utils import DesktopApp
+
+from utils.config import CONFIG
+from utils.io_worker import io_worker
+
+from gi.repository import Gio, GLib, Gtk, GdkPixbuf
+
+APPLICATIONS_CACHE_FILE = f"{CONFIG['cache-folder']}/applications.json"
+ICON_ATLAS_FILE = f"{CONFIG['cache-folder']}/applications-icons-{{size}}.png"
+ICON_ATLAS_COLUMNS = 32
+CACHE_VERSION = 1
+REBUILD_DELAY = 1000  # ms, .desktop files tend to change in bursts
+
+
+def get_applications_dirs() -> list[str]:
+    return [
+        os.path.join(data_dir, "applications")
+        for data_dir in [GLib.get_user_data_dir(), *GLib.get_system_data_dirs()]
+    ]
+
+
+def get_dirs_mtimes() -> dict[str, float]:
+    return {
+        path: os.stat(path).st_mtime
+        for path in get_applications_dirs()
+        if os.path.isdir(path)
+    }
+
+
+class CachedDesktopApp:
+    """Desktop application metadata loaded from the on-disk cache.
+
+    Exposes the same attributes the launcher reads from `DesktopApp`; the
+    real `Gio.DesktopAppInfo` is only looked up when the app is launched.
+    """
+
+    def __init__(self, data: dict, atlas: Optional[GdkPixbuf.Pixbuf] = None, icon_size: int = 0):
+        self.id: str = data["id"]
+        self.name: str = data.get("name") or ""
+        self.display_name: str = data.get("display-name") or ""
+        self.generic_name: Optional[str] = data.get("generic-name")
+        self.description: Optional[str] = data.get("description")
+        self.executable: Optional[str] = data.get("executable")
+        self.icon_name: Optional[str] = data.get("icon-name")
+        self._atlas_cell: Optional[int] = data.get("atlas-cell")
+        self._atlas = atlas
+        self._icon_size = icon_size
+
+    def get_icon_pixbuf(self, size: int = 24) -> Optional[GdkPixbuf.Pixbuf]:
+        if self._atlas and self._atlas_cell is not None and size == self._icon_size:
+            row, column = divmod(self._atlas_cell, ICON_ATLAS_COLUMNS)
+            return self._atlas.new_subpixbuf(column * size, row * size, size, size)
+        return render_icon(self.icon_name, size)
+
+    def launch(self):
+        if not (app_info := Gio.DesktopAppInfo.new(self.id)):
+            return logger.warning(f"[Apps] {self.id} is no longer installed")
+        return DesktopApp(app_info).launch()
+
+    def __repr__(self):
+        return f"<CachedDesktopApp {self.id}>"
+
+
+def render_icon(icon_name: Optional[str], size: int) -> Optional[GdkPixbuf.Pixbuf]:
+    theme = Gtk.IconTheme.get_default()
+    flags = Gtk.IconLookupFlags.FORCE_SIZE
+    try:
+        if icon_name:
+            icon = Gio.Icon.new_for_string(icon_name)
+            if info := theme.lookup_by_gicon(icon, size, flags):
+                return info.load_icon()
+        return theme.load_icon("application-x-executable", size, flags)
+    except GLib.Error:
+        return None
+
+
+def lookup_icon_path(icon_name: Optional[str], size: int) -> Optional[str]:
+    theme = Gtk.IconTheme.get_default()
+    flags = Gtk.IconLookupFlags.FORCE_SIZE
+    if icon_name:
+        info = theme.lookup_by_gicon(Gio.Icon.new_for_string(icon_name), size, flags)
+    else:
+        info = theme.lookup_icon("application-x-executable", size, flags)
+    return info.get_filename() if info else None
+
+
+def build_cache(
+    mtimes: dict[str, float],
+    entries: list[dict],
+    icon_paths: list[Optional[str]],
+    size: int,
+    atlas_path: str,
+) -> tuple[list[dict], GdkPixbuf.Pixbuf]:
+    """Render the icon atlas and write it with the application list.
+
+    Only touches files and pixbufs, so it may run off the main loop. Apps
+    whose icon has no file are left out of the atlas and rendered on use.
+    """
+    rows = max(1, math.ceil(len(entries) / ICON_ATLAS_COLUMNS))
+    atlas = GdkPixbuf.Pixbuf.new(
+        GdkPixbuf.Colorspace.RGB, True, 8, ICON_ATLAS_COLUMNS * size, rows * size)
+    atlas.fill(0x00000000)
+
+    for index, (entry, icon_path) in enumerate(zip(entries, icon_paths)):
+        if icon_path is None:
+            continue
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_size(icon_path, size, size)
+        except GLib.Error:
+            continue
+        if pixbuf.get_width() != size or pixbuf.get_height() != size:
+            pixbuf = pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
+        if not pixbuf.get_has_alpha():
+            pixbuf = pixbuf.add_alpha(False, 0, 0, 0)
+        row, column = divmod(index, ICON_ATLAS_COLUMNS)
+        pixbuf.copy_area(0, 0, size, size, atlas, column * size, row * size)
+        entry["atlas-cell"] = index
+
+    try:
+        atlas.savev(f"{atlas_path}.tmp", "png", [], [])
+        os.replace(f"{atlas_path}.tmp", atlas_path)
+        with open(f"{APPLICATIONS_CACHE_FILE}.tmp", "w") as file:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "icon-size": size,
+                    "mtimes": mtimes,
+                    "applications": entries,
+                },
+                file,
+            )
+        os.replace(f"{APPLICATIONS_CACHE_FILE}.tmp", APPLICATIONS_CACHE_FILE)
+    except (OSError, GLib.Error) as e:
+        logger.error(f"[Apps] Failed to write application cache: {e}")
+
+    logger.info(f"[Apps] Rebuilt application cache with {len(entries)} applications")
+    return entries, atlas
+
+
+class DesktopApps(Service):
+    """A service to provide the installed desktop applications.
+
+    The application list and a pre-rendered icon atlas are cached under
+    `~/.cache/nisfere` and reused as long as the applications directories
+    are unchanged. File monitors on those directories rebuild the cache on
+    the I/O worker when `.desktop` files are added or removed.
+    """
+
+    @Signal
+    def changed(self) -> None:
+        """Signal emitted when the application list was rebuilt."""
+        pass
+
+    @Property(list, "readable")
+    def applications(self) -> list[CachedDesktopApp]:
+        if self._applications is None:
+            self._applications = self._load_cache() or self._rebuild()
+        return self._applications
+
+    def __init__(self, icon_size: int = 24, **kwargs):
+        super().__init__(**kwargs)
+        self._icon_size = icon_size
+        self._applications: Optional[list[CachedDesktopApp]] = None
+        self._rebuild_id: Optional[int] = None
+        self._monitors: list[Gio.FileMonitor] = []
+
+        os.makedirs(CONFIG["cache-folder"], exist_ok=True)
+
+        for path in get_applications_dirs():
+            if not os.path.isdir(path):
+                continue
+            monitor = Gio.File.new_for_path(path).monitor_directory(
+                Gio.FileMonitorFlags.NONE, None)
+            monitor.connect("changed", lambda *args: self._schedule_rebuild())
+            self._monitors.append(monitor)
+
+    def _atlas_path(self) -> str:
+        return ICON_ATLAS_FILE.format(size=self._icon_size)
+
+    def _load_cache(self) -> Optional[list[CachedDesktopApp]]:
+        try:
+            with open(APPLICATIONS_CACHE_FILE, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if (
+            data.get("version") != CACHE_VERSION
+            or data.get("icon-size") != self._icon_size
+            or data.get("mtimes") != get_dirs_mtimes()
+        ):
+            logger.info("[Apps] Application cache is stale")
+            return None
+
+        try:
+            atlas = GdkPixbuf.Pixbuf.new_from_file(self._atlas_path())
+        except GLib.Error:
+            atlas = None
+
+        applications = [
+            CachedDesktopApp(app, atlas=atlas, icon_size=self._icon_size)
+            for app in data.get("applications", [])
+        ]
+        logger.info(f"[Apps] Loaded {len(applications)} applications from cache")
+        return applications
+
+    def _collect(self) -> tuple[dict[str, float], list[dict], list[Optional[str]]]:
+        """Read the installed applications and resolve their icon files.
+
+        Icon theme lookups stay on the main loop, the files themselves are
+        loaded by `build_cache`.
+        """
+        mtimes = get_dirs_mtimes()
+        app_infos = sorted(
+            (
+                app_info
+                for app_info in Gio.DesktopAppInfo.get_all()
+                if app_info.should_show() and app_info.get_id()
+            ),
+            key=lambda app_info: (app_info.get_display_name() or "").casefold(),
+        )
+
+        entries = []
+        icon_paths = []
+        for app_info in app_infos:
+            icon = app_info.get_icon()
+            icon_name = icon.to_string() if icon else None
+            entries.append({
+                "id": app_info.get_id(),
+                "name": app_info.get_name(),
+                "display-name": app_info.get_display_name(),
+                "generic-name": app_info.get_generic_name(),
+                "description": app_info.get_description(),
+                "executable": app_info.get_executable(),
+                "icon-name": icon_name,
+                "atlas-cell": None,
+            })
+            icon_paths.append(lookup_icon_path(icon_name, self._icon_size))
+        return mtimes, entries, icon_paths
+
+    def _rebuild(self) -> list[CachedDesktopApp]:
+        entries, atlas = build_cache(*self._collect(), self._icon_size, self._atlas_path())
+        return self._to_apps(entries, atlas)
+
+    def _to_apps(self, entries: list[dict], atlas: GdkPixbuf.Pixbuf) -> list[CachedDesktopApp]:
+        return [CachedDesktopApp(entry, atlas=atlas, icon_size=self._icon_size) for entry in entries]
+
+    def _schedule_rebuild(self):
+        if self._rebuild_id is not None:
+            GLib.source_remove(self._rebuild_id)
+        self._rebuild_id = GLib.timeout_add(REBUILD_DELAY, self._on_rebuild)
+
+    def _on_rebuild(self) -> bool:
+        self._rebuild_id = None
+        # the atlas is rendered and written on the worker, not the main loop
+        io_worker.submit(
+            build_cache,
+            *self._collect(),
+            self._icon_size,
+            self._atlas_path(),
+            callback=self._on_rebuilt,
+        )
+        return False
+
+    def _on_rebuilt(self, result: tuple[list[dict], GdkPixbuf.Pixbuf]):
+        self._applications = self._to_apps(*result)
+        self.notify("applications")
+        self.changed.emit()
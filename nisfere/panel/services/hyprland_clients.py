@@ -1,13 +1,42 @@
-import json
+from collections import Counter, deque
 from loguru import logger
 from typing import Optional
 
 from fabric.core.service import Service, Signal, Property
-from fabric.hyprland.service import Hyprland
+from fabric.hyprland.service import Hyprland, HyprlandEvent
 from fabric.hyprland.widgets import get_hyprland_connection
 
 from fabric.utils.helpers import bulk_connect
 
+from services.hyprland_ipc import HyprlandIPC
+
+from gi.repository import GLib
+
+RESYNC_INTERVAL = 5 * 60  # seconds, catches events that were missed or misread
+MAX_PENDING_EVENTS = 500
+
+
+def normalize_address(address: str) -> str:
+    """Events send window addresses without the `0x` prefix used by `j/clients`."""
+    address = address.strip()
+    return address if address.startswith("0x") else f"0x{address}"
+
+
+def client_state(client_data: dict, focused: bool) -> tuple:
+    """Return the values behind the `HyprlandClient` properties.
+
+    `j/clients` has more fields (geometry, focus history) that change
+    without the client looking any different.
+    """
+    return (
+        client_data.get("title"),
+        client_data.get("class"),
+        client_data.get("workspace", {}).get("id"),
+        client_data.get("pid"),
+        client_data.get("floating", False),
+        focused,
+    )
+
 
 class HyprlandClient(Service):
 
@@ -47,6 +76,8 @@ class HyprlandClient(Service):
 
     @focused.setter
     def focused(self, value: bool):
+        if self._focused == value:
+            return
         self._focused = value
         self.changed.emit()
 
@@ -56,8 +87,20 @@ class HyprlandClient(Service):
         self._focused = client_data.get("focusHistoryID", 1) == 0
 
     def update(self, client_data: dict):
+        """Replace the client data, emitting `changed` only if a property differs."""
+        focused = client_data.get("focusHistoryID", 1) == 0
+        changed = (
+            client_state(client_data, focused)
+            != client_state(self._client_data, self._focused)
+        )
         self._client_data = client_data
-        self._focused = client_data.get("focusHistoryID", 1) == 0
+        self._focused = focused
+        if changed:
+            self.changed.emit()
+
+    def patch(self, **fields):
+        """Apply a partial update coming from a single event."""
+        self._client_data = {**self._client_data, **fields}
         self.changed.emit()
 
     def close(self):
@@ -68,7 +111,14 @@ class HyprlandClient(Service):
 
 
 class HyprlandClients(Service):
-    """Clients service to detect the active client"""
+    """Clients service to detect the active client.
+
+    The client table is built once from `j/clients` and then kept up to date
+    by applying the deltas carried by socket2 events. A full resync is done
+    when an event references state we can't reconstruct locally, and every
+    `RESYNC_INTERVAL` as a consistency check. Events arriving while a
+    snapshot is on its way are queued and replayed on top of it.
+    """
 
     @Signal
     def initialized(self) -> None: ...
@@ -89,12 +139,22 @@ class HyprlandClients(Service):
     def clients(self) -> list:
         return self._clients.values()
 
-    def __init__(self):
+    def __init__(self, ipc: HyprlandIPC):
         super().__init__()
         self._connection: Hyprland = get_hyprland_connection()
+        self._ipc = ipc
+        self._ready = False
+        self._resyncing = False
+        self._replaying = False
+        self._pending_events: deque[tuple] = deque(maxlen=MAX_PENDING_EVENTS)
         self._clients: dict[str, HyprlandClient] = {}
         # Now stores HyprlandClient instance
         self._active_client: Optional[HyprlandClient] = None
+        self._active_workspace: int = 0
+        # workspace name -> id, needed because `openwindow` only carries the name
+        self._workspace_ids: dict[str, int] = {}
+        # workspace id -> number of clients on it
+        self._workspace_counts: Counter[int] = Counter()
 
         if self._connection.ready:
             self._initialize()
@@ -105,74 +165,247 @@ class HyprlandClients(Service):
         bulk_connect(
             self._connection,
             {
-                "event::activewindow": lambda *args: self._get_hypr_clients(),
-                # "event::closewindow": lambda *args: self._get_hypr_clients(),
-                # "event::workspace": lambda *args: self._check_workspace()
+                f"event::{name}": lambda _, event, handler=handler: self._on_event(handler, event)
+                for name, handler in {
+                    "openwindow": self._on_open_window,
+                    "closewindow": self._on_close_window,
+                    "movewindowv2": self._on_move_window,
+                    "windowtitlev2": self._on_window_title,
+                    "changefloatingmode": self._on_floating_mode,
+                    "activewindowv2": self._on_active_window,
+                    "workspacev2": self._on_workspace,
+                    "focusedmonv2": self._on_focused_monitor,
+                    "createworkspacev2": self._on_create_workspace,
+                    "configreloaded": lambda event: self._resync(),
+                }.items()
             }
         )
 
-    def _initialize(self):
-        raw_clients = json.loads(
-            self._connection.send_command("j/clients").reply.decode())
-
-        for client_data in raw_clients:
-            new_client = HyprlandClient(client_data)
-            self._clients[new_client.address] = new_client
+        GLib.timeout_add_seconds(RESYNC_INTERVAL, self._on_resync_timeout)
 
-        self.initialized.emit()
-
-        self.empty_workspace.emit() if len(
-            self._clients) == 0 else self.filled_workspace.emit()
-
-        logger.info(
-            f"[Dock] Loaded {len(self._clients)} clients: {list(self._clients.values())}")
+    def _initialize(self):
+        self._resync()
+
+    def _on_event(self, handler, event: HyprlandEvent):
+        # a snapshot on its way may or may not include this event, so it is
+        # applied on top of the snapshot; handlers tolerate repeated events
+        if not self._ready or self._resyncing:
+            self._pending_events.append((handler, event))
+            return
+        handler(event)
+
+    def _replay_events(self):
+        pending = list(self._pending_events)
+        self._pending_events.clear()
+        # the snapshot is as fresh as it gets, replayed events don't resync
+        self._replaying = True
+        try:
+            for handler, event in pending:
+                self._on_event(handler, event)
+        finally:
+            self._replaying = False
+
+    def _on_resync_timeout(self) -> bool:
+        self._resync()
+        return True
+
+    def _resync(self):
+        """Fetch the whole client list and diff it against the local table."""
+        if self._resyncing or self._replaying:
+            return
+        self._resyncing = True
+
+        # the queries are in flight at the same time
+        requests = [
+            clients_request := self._ipc.send_command("j/clients"),
+            workspaces_request := self._ipc.send_command("j/workspaces"),
+            workspace_request := self._ipc.send_command("j/activeworkspace"),
+        ]
+
+        def on_done(*_):
+            if not all(request.done for request in requests):
+                return
+            self._resyncing = False
+            was_ready = self._ready
+            occupancy = self._occupancy()
+            try:
+                if error := next((request.error for request in requests if request.error), None):
+                    raise error
+                raw_clients = clients_request.json()
+                raw_workspaces = workspaces_request.json()
+                self._active_workspace = workspace_request.json().get("id", 0)
+            except Exception as e:
+                logger.error(f"[Dock] Failed to fetch clients: {e}")
+                if self._ready:
+                    self._replay_events()
+                return
+
+            self._workspace_ids = {workspace["name"]: workspace["id"] for workspace in raw_workspaces}
+            self._apply_snapshot(raw_clients, emit=self._ready)
+
+            if not self._ready:
+                self._ready = True
+                self.initialized.emit()
+                logger.info(
+                    f"[Dock] Loaded {len(self._clients)} clients: {list(self._clients.values())}")
+            else:
+                logger.debug(f"[Dock] Resynced {len(self._clients)} clients")
 
-    def _get_hypr_clients(self):
+            self._replay_events()
+            # a periodic resync that changed nothing doesn't re-trigger the dock
+            if not was_ready or self._occupancy() != occupancy:
+                self._check_workspace()
 
-        raw_clients = json.loads(
-            self._connection.send_command("j/clients").reply.decode())
+        for request in requests:
+            request.add_done_callback(on_done)
 
+    def _apply_snapshot(self, raw_clients: list[dict], emit: bool = True):
         new_clients = {c["address"]: c for c in raw_clients}
 
         # Find removed clients
-        removed_clients = set(self._clients.keys()) - set(new_clients.keys())
-        for removed in removed_clients:
-            removed_client = self._clients.pop(removed, None)
-            if removed_client:
-                removed_client.close()  # Emit closed signal
-                self.client_removed.emit(removed_client)
-                logger.info(f"[Dock] Client removed: {removed_client}")
+        for removed in set(self._clients.keys()) - set(new_clients.keys()):
+            self._remove_client(removed, emit=emit)
 
         # Check for added and updated clients
         for address, client_data in new_clients.items():
+            workspace = client_data.get("workspace", {})
+            self._workspace_ids[workspace.get("name", "")] = workspace.get("id", -1)
+
             if address not in self._clients:
-                # New client detected
-                new_client = HyprlandClient(client_data)
-                self._clients[address] = new_client
-                self.client_added.emit(new_client)
-                logger.info(
-                    f"[Dock] New client added: {new_client.class_name}")
+                self._add_client(client_data, emit=emit)
             else:
-                # Existing client, update data
-                existing_client = self._clients[address]
-                existing_client.update(client_data)
+                # emits only for clients that differ from the snapshot
+                self._clients[address].update(client_data)
+
+        # recounted rather than adjusted, in case the counts drifted
+        self._workspace_counts = Counter(client.workspace for client in self._clients.values())
+        self._active_client = self._get_focused_client()
+
+    def _add_client(self, client_data: dict, emit: bool = True):
+        new_client = HyprlandClient(client_data)
+        self._clients[new_client.address] = new_client
+        self._workspace_counts[new_client.workspace] += 1
+        if emit:
+            self.client_added.emit(new_client)
+            logger.info(f"[Dock] New client added: {new_client.class_name}")
+        return new_client
+
+    def _remove_client(self, address: str, emit: bool = True):
+        removed_client = self._clients.pop(address, None)
+        if not removed_client:
+            return
+        self._workspace_counts[removed_client.workspace] -= 1
+        if removed_client is self._active_client:
+            self._active_client = None
+        removed_client.close()  # Emit closed signal
+        if emit:
+            self.client_removed.emit(removed_client)
+            logger.info(f"[Dock] Client removed: {removed_client}")
+
+    def _on_open_window(self, event: HyprlandEvent):
+        if len(event.data) < 4:
+            return self._resync()
+
+        address, workspace_name, class_name = event.data[:3]
+        title = ",".join(event.data[3:])
+        address = normalize_address(address)
+
+        workspace_id = self._workspace_ids.get(workspace_name)
+        if workspace_id is None:
+            if not workspace_name.lstrip("-").isdigit():
+                # special/named workspace we haven't seen yet
+                return self._resync()
+            workspace_id = int(workspace_name)
+
+        if address in self._clients:
+            return
+
+        self._add_client(
+            {
+                "address": address,
+                "class": class_name,
+                "title": title,
+                "workspace": {"id": workspace_id, "name": workspace_name},
+                "floating": False,
+                "focusHistoryID": -1,
+            }
+        )
+        self._check_workspace()
 
+    def _on_close_window(self, event: HyprlandEvent):
+        self._remove_client(normalize_address(event.data[0]))
         self._check_workspace()
 
-        logger.info(f"[Dock] Updated {len(self._clients)} clients")
+    def _on_move_window(self, event: HyprlandEvent):
+        if len(event.data) < 3:
+            return self._resync()
 
-    def _check_workspace(self):
-        current_ws = json.loads(self._connection.send_command(
-            "j/activeworkspace").reply.decode()).get("id", 0)
+        address, workspace_id, workspace_name = event.data[:3]
+        if not (client := self._clients.get(normalize_address(address))):
+            return self._resync()
 
+        self._workspace_ids[workspace_name] = int(workspace_id)
+        self._workspace_counts[client.workspace] -= 1
+        client.patch(workspace={"id": int(workspace_id), "name": workspace_name})
+        self._workspace_counts[client.workspace] += 1
+        self._check_workspace()
+
+    def _on_window_title(self, event: HyprlandEvent):
+        if len(event.data) < 2:
+            return
+        if client := self._clients.get(normalize_address(event.data[0])):
+            client.patch(title=",".join(event.data[1:]))
+
+    def _on_floating_mode(self, event: HyprlandEvent):
+        if len(event.data) < 2:
+            return
+        if client := self._clients.get(normalize_address(event.data[0])):
+            client.patch(floating=event.data[1] == "1")
+
+    def _on_active_window(self, event: HyprlandEvent):
+        address = event.data[0] if event.data else ""
+        new_client = self._clients.get(normalize_address(address)) if address else None
+
+        if address and not new_client:
+            return self._resync()
+
+        if self._active_client and self._active_client is not new_client:
+            self._active_client.focused = False
+        if new_client:
+            new_client.focused = True
+        self._active_client = new_client
+
+    def _on_workspace(self, event: HyprlandEvent):
+        if len(event.data) < 2:
+            return
+        workspace_id, workspace_name = event.data[:2]
+        self._workspace_ids[workspace_name] = int(workspace_id)
+        self._active_workspace = int(workspace_id)
+        self._check_workspace()
+
+    def _on_focused_monitor(self, event: HyprlandEvent):
+        if len(event.data) < 2:
+            return
+        self._active_workspace = int(event.data[1])
+        self._check_workspace()
+
+    def _on_create_workspace(self, event: HyprlandEvent):
+        if len(event.data) < 2:
+            return
+        self._workspace_ids[event.data[1]] = int(event.data[0])
+
+    def _check_workspace(self):
         # if a client is inside the current workspace emit the filled signal
-        if any(ws.workspace == current_ws for ws in self._clients.values()):
+        if self._workspace_counts[self._active_workspace] > 0:
             self.filled_workspace.emit()
-        # if not client found, find the current focused client and change the focused value to False, also emit the empty signal
+        # if not client found, change the focused client's value to False, also emit the empty signal
         else:
-            if (focused_client := self._get_focused_client()):
-                focused_client.focused = False
+            if self._active_client:
+                self._active_client.focused = False
             self.empty_workspace.emit()
 
+    def _occupancy(self) -> tuple[int, bool]:
+        return self._active_workspace, self._workspace_counts[self._active_workspace] > 0
+
     def _get_focused_client(self) -> Optional[HyprlandClient]:
         return next((client for client in self._clients.values() if client.focused), None)
@@ -0,0 +1,131 @@
+from loguru import logger
+
+from fabric.core.service import Service, Signal, Property
+
+from services.hyprland_ipc import HyprlandIPC, HyprlandRequest
+
+from gi.repository import GLib
+
+FRAME_INTERVAL = 16  # ms, one frame at 60Hz
+
+
+class HyprlandDispatcher(Service):
+    """A service to send compositor commands without blocking or forking.
+
+    Commands queued within the same frame are coalesced and written to the
+    Hyprland socket as a single `[[BATCH]]` request. A command containing
+    `;`, like an `exec` of a shell line, is sent on its own, since `;`
+    separates the commands of a batch.
+    """
+
+    @Signal
+    def flushed(self, count: int) -> None:
+        """Signal emitted after a batch has been answered by Hyprland."""
+        pass
+
+    @Property(int, "readable")
+    def dispatched(self) -> int:
+        """Return the number of commands sent successfully so far."""
+        return self._dispatched
+
+    @Property(int, "readable")
+    def failed(self) -> int:
+        """Return the number of commands whose request failed."""
+        return self._failed
+
+    @Property(int, "readable")
+    def batches(self) -> int:
+        """Return the number of socket round-trips used to send them."""
+        return self._batches
+
+    @Property(float, "readable")
+    def last_latency(self) -> float:
+        """Return the round-trip time of the last batch in milliseconds."""
+        return self._last_latency
+
+    @Property(float, "readable")
+    def average_latency(self) -> float:
+        """Return the average batch round-trip time in milliseconds."""
+        return self._total_latency / self._batches if self._batches else 0.0
+
+    @Property(dict, "readable")
+    def metrics(self) -> dict:
+        return {
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "batches": self.batches,
+            "pending": len(self._pending),
+            "last-latency": self.last_latency,
+            "average-latency": self.average_latency,
+        }
+
+    def __init__(self, ipc: HyprlandIPC, **kwargs):
+        super().__init__(**kwargs)
+        self._ipc = ipc
+        self._pending: list[str] = []
+        self._flush_id: int | None = None
+        self._dispatched = 0
+        self._failed = 0
+        self._batches = 0
+        self._last_latency = 0.0
+        self._total_latency = 0.0
+
+    def dispatch(self, dispatcher: str, args: str = ""):
+        """Queue `hyprctl dispatch <dispatcher> <args>`."""
+        self.command(f"dispatch {dispatcher} {args}".strip())
+
+    def command(self, command: str):
+        """Queue a raw socket command, e.g. `switchxkblayout current next`."""
+        self._pending.append(command)
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(FRAME_INTERVAL, self._on_frame)
+
+    def _on_frame(self) -> bool:
+        self._flush_id = None
+        self.flush()
+        return False
+
+    def flush(self):
+        """Send the queued commands right away."""
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+
+        if not (commands := self._pending):
+            return
+        self._pending = []
+
+        # consecutive batchable commands go together, in queue order
+        groups: list[list[str]] = []
+        for command in commands:
+            if ";" in command or not groups or ";" in groups[-1][0]:
+                groups.append([command])
+            else:
+                groups[-1].append(command)
+
+        for group in groups:
+            request = (
+                self._ipc.send_command(group[0])
+                if len(group) == 1
+                else self._ipc.send_batch(group)
+            )
+            request.add_done_callback(
+                lambda req, count=len(group): self._on_flushed(req, count))
+
+    def _on_flushed(self, request: HyprlandRequest, count: int):
+        if request.error:
+            logger.warning(
+                f"[Dispatcher] '{request.command}' failed: {request.error}")
+            self._failed += count
+        else:
+            self._dispatched += count
+        self._batches += 1
+        self._last_latency = request.latency * 1000
+        self._total_latency += self._last_latency
+
+        for prop in ("dispatched", "failed", "batches", "last-latency", "average-latency"):
+            self.notify(prop)
+        self.flushed.emit(count)
+
+        logger.debug(
+            f"[Dispatcher] Sent {count} command(s) in {self._last_latency:.2f} ms")
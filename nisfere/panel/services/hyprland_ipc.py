@@ -0,0 +1,173 @@
+import os
+import json
+import time
+from collections import deque
+from typing import Callable, Optional
+from loguru import logger
+
+from fabric.core.service import Service, Property
+
+from gi.repository import Gio, GLib
+
+MAX_IN_FLIGHT = 4
+READ_CHUNK_SIZE = 8192
+
+
+def get_hyprland_socket_path() -> str:
+    """Return the path of the Hyprland command socket (socket1)."""
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    path = f"{runtime_dir}/hypr/{signature}/.socket.sock"
+    if os.path.exists(path):
+        return path
+    # Older Hyprland versions keep their sockets under /tmp
+    return f"/tmp/hypr/{signature}/.socket.sock"
+
+
+class HyprlandRequest:
+    """A pending command sent to Hyprland, resolved once the reply is read."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.reply: Optional[str] = None
+        self.error: Optional[Exception] = None
+        self.done = False
+        self.queued_at = time.monotonic()
+        self.latency: float = 0.0
+        self._callbacks: list[Callable[["HyprlandRequest"], None]] = []
+
+    def add_done_callback(self, callback: Callable[["HyprlandRequest"], None]) -> "HyprlandRequest":
+        if self.done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+        return self
+
+    def json(self):
+        return json.loads(self.reply) if self.reply else None
+
+    def resolve(self, reply: Optional[str] = None, error: Optional[Exception] = None):
+        self.reply = reply
+        self.error = error
+        self.done = True
+        self.latency = time.monotonic() - self.queued_at
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"[HyprlandIPC] Callback for '{self.command}' failed: {e}")
+        self._callbacks.clear()
+
+    def __repr__(self):
+        return f"<HyprlandRequest {self.command!r} done={self.done}>"
+
+
+class HyprlandIPC(Service):
+    """Non-blocking client for the Hyprland command socket.
+
+    Requests are queued and written through Gio's async socket API, so the
+    main loop never waits on a compositor round-trip. Hyprland answers one
+    request per connection, so up to `MAX_IN_FLIGHT` connections are kept
+    open at once and the rest wait in the queue.
+    """
+
+    @Property(int, "readable")
+    def pending(self) -> int:
+        return len(self._queue) + self._in_flight
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client = Gio.SocketClient.new()
+        self._queue: deque[HyprlandRequest] = deque()
+        self._in_flight = 0
+
+    def send_command(self, command: str) -> HyprlandRequest:
+        """Queue a raw command (e.g. `dispatch workspace 1`) and return its request."""
+        request = HyprlandRequest(command)
+        self._queue.append(request)
+        self._pump()
+        return request
+
+    def send_batch(self, commands: list[str]) -> HyprlandRequest:
+        """Send several commands in a single `[[BATCH]]` round-trip."""
+        if any(";" in command for command in commands):
+            # `;` separates batched commands, it would split this one
+            raise ValueError("Commands containing ';' can't be batched")
+        return self.send_command(f"[[BATCH]]{';'.join(commands)}")
+
+    def send_json(self, command: str, callback: Callable[[object], None]) -> HyprlandRequest:
+        """Query `j/<command>` and call `callback` with the decoded reply."""
+
+        def on_done(request: HyprlandRequest):
+            if request.error:
+                return logger.warning(
+                    f"[HyprlandIPC] '{command}' failed: {request.error}")
+            try:
+                data = request.json()
+            except json.JSONDecodeError as e:
+                return logger.warning(
+                    f"[HyprlandIPC] '{command}' returned invalid json: {e}")
+            callback(data)
+
+        return self.send_command(f"j/{command}").add_done_callback(on_done)
+
+    def dispatch(self, dispatcher: str, args: str = "") -> HyprlandRequest:
+        return self.send_command(f"dispatch {dispatcher} {args}".strip())
+
+    def _pump(self):
+        while self._queue and self._in_flight < MAX_IN_FLIGHT:
+            self._in_flight += 1
+            self._start(self._queue.popleft())
+
+    def _finish(self, request: HyprlandRequest, connection=None, reply=None, error=None):
+        if connection:
+            connection.close_async(GLib.PRIORITY_DEFAULT, None, None)
+        self._in_flight -= 1
+        request.resolve(reply=reply, error=error)
+        self._pump()
+
+    def _start(self, request: HyprlandRequest):
+        address = Gio.UnixSocketAddress.new(get_hyprland_socket_path())
+
+        def on_connected(client, result):
+            try:
+                connection = client.connect_finish(result)
+            except GLib.Error as e:
+                return self._finish(request, error=e)
+
+            connection.get_output_stream().write_all_async(
+                request.command.encode(),
+                GLib.PRIORITY_DEFAULT,
+                None,
+                lambda stream, res: on_written(connection, stream, res),
+            )
+
+        def on_written(connection, stream, result):
+            try:
+                stream.write_all_finish(result)
+            except GLib.Error as e:
+                return self._finish(request, connection, error=e)
+            read_next(connection, [])
+
+        def read_next(connection, chunks: list[bytes]):
+            connection.get_input_stream().read_bytes_async(
+                READ_CHUNK_SIZE,
+                GLib.PRIORITY_DEFAULT,
+                None,
+                lambda stream, res: on_read(connection, chunks, stream, res),
+            )
+
+        def on_read(connection, chunks: list[bytes], stream, result):
+            try:
+                data = stream.read_bytes_finish(result)
+            except GLib.Error as e:
+                return self._finish(request, connection, error=e)
+
+            if data.get_size() == 0:
+                return self._finish(
+                    request, connection, reply=b"".join(chunks).decode(errors="replace"))
+
+            chunks.append(data.get_data())
+            read_next(connection, chunks)
+
+        self._client.connect_async(address, None, on_connected)
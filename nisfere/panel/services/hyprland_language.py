@@ -1,5 +1,4 @@
 import re
-import json
 from loguru import logger
 
 from fabric.core.service import Service, Signal, Property
@@ -7,6 +6,8 @@ from fabric.utils.helpers import FormattedString
 from fabric.hyprland.service import Hyprland, HyprlandEvent
 
 from fabric.hyprland.widgets import get_hyprland_connection
+from services.hyprland_ipc import HyprlandIPC
+from services.hyprland_dispatcher import HyprlandDispatcher
 from utils.config import CONFIG
 
 
@@ -22,9 +23,11 @@ class HyprlandLanguage(Service):
     def language(self) -> str:
         return self._language
 
-    def __init__(self, keyboard=".*"):
+    def __init__(self, ipc: HyprlandIPC, dispatcher: HyprlandDispatcher, keyboard=".*"):
         super().__init__()
         self._connection: Hyprland = get_hyprland_connection()
+        self._ipc = ipc
+        self._dispatcher = dispatcher
         self._keyboard = keyboard
         self._formatter: FormattedString = FormattedString(
             string="{get_language(language)}",
@@ -41,9 +44,9 @@ class HyprlandLanguage(Service):
         self._connection.connect("event::activelayout", self._on_activelayout)
 
     def _get_active_language(self, *_):
-        devices: dict[str, list[dict[str, str]]] = json.loads(
-            str(self._connection.send_command("j/devices").reply.decode())
-        )
+        self._ipc.send_json("devices", self._on_devices)
+
+    def _on_devices(self, devices: dict[str, list[dict[str, str]]]):
         if not devices or not (keyboards := devices.get("keyboards")):
             return logger.warning(
                 f"[Language] cound't get devices from hyprctl, gotten data\n{devices}"
@@ -94,4 +97,4 @@ class HyprlandLanguage(Service):
         )
 
     def change_language(self):
-        self._connection.send_command("switchxkblayout current next")
+        self._dispatcher.command("switchxkblayout current next")
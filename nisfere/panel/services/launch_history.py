@@ -0,0 +1,116 @@
+import os
+import json
+import time
+from typing import Optional
+from loguru import logger
+
+from fabric.core.service import Service, Signal, Property
+
+from utils.config import CONFIG
+from utils.io_worker import io_worker
+
+LAUNCH_LOG_FILE = f"{CONFIG['cache-folder']}/launches.log"
+LAUNCH_TABLE_FILE = f"{CONFIG['cache-folder']}/launches.json"
+HALF_LIFE = 7 * 24 * 60 * 60  # a launch is worth half as much after a week
+COMPACT_AFTER = 200  # log lines
+
+
+def decay(score: float, since: float, now: float) -> float:
+    return score * 0.5 ** (max(0.0, now - since) / HALF_LIFE)
+
+
+def append_launch(app_id: str, timestamp: float):
+    with open(LAUNCH_LOG_FILE, "a") as file:
+        file.write(f"{timestamp:.0f}\t{app_id}\n")
+
+
+def write_table(table: dict[str, list]):
+    """Write the ranked table atomically and truncate the log it replaces."""
+    with open(f"{LAUNCH_TABLE_FILE}.tmp", "w") as file:
+        json.dump(table, file)
+    os.replace(f"{LAUNCH_TABLE_FILE}.tmp", LAUNCH_TABLE_FILE)
+    open(LAUNCH_LOG_FILE, "w").close()
+
+
+class LaunchHistory(Service):
+    """A service to rank applications by how often and how recently they were launched.
+
+    Launches are appended to a small log; once it grows past
+    `COMPACT_AFTER` lines it is folded into a ranked table. Each entry keeps
+    an exponentially decayed score, so frequent and recent launches rank
+    first. Nothing is read until the first score is requested and all
+    writes run on the I/O worker thread.
+    """
+
+    @Signal
+    def changed(self) -> None: ...
+
+    @Property(dict, "readable")
+    def table(self) -> dict[str, list]:
+        """Return `{app_id: [score, last_launch, launches]}`."""
+        return self._load()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._table: Optional[dict[str, list]] = None
+        self._log_lines = 0
+
+    def _load(self) -> dict[str, list]:
+        if self._table is not None:
+            return self._table
+
+        self._table = {}
+        try:
+            with open(LAUNCH_TABLE_FILE, "r") as file:
+                self._table = json.load(file)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.warning(f"[LaunchHistory] Ignoring corrupt table: {e}")
+
+        try:
+            with open(LAUNCH_LOG_FILE, "r") as file:
+                for line in file:
+                    # counted even when unreadable, compaction drops it from the file
+                    self._log_lines += 1
+                    timestamp, _, app_id = line.rstrip("\n").partition("\t")
+                    try:
+                        launched_at = float(timestamp)
+                    except ValueError as e:
+                        logger.warning(f"[LaunchHistory] Ignoring corrupt log line: {e}")
+                        continue
+                    if app_id:
+                        self._apply(app_id, launched_at)
+        except FileNotFoundError:
+            pass
+
+        return self._table
+
+    def _apply(self, app_id: str, timestamp: float):
+        score, last_launch, launches = self._table.get(app_id, (0.0, timestamp, 0))
+        self._table[app_id] = [
+            decay(score, last_launch, timestamp) + 1.0,
+            timestamp,
+            launches + 1,
+        ]
+
+    def score(self, app_id: str) -> float:
+        """Return the frecency score of `app_id` right now."""
+        if not (entry := self._load().get(app_id)):
+            return 0.0
+        return decay(entry[0], entry[1], time.time())
+
+    def record(self, app_id: str):
+        """Record a launch of `app_id`."""
+        timestamp = time.time()
+        self._load()
+        self._apply(app_id, timestamp)
+        self._log_lines += 1
+
+        if self._log_lines >= COMPACT_AFTER:
+            self._log_lines = 0
+            io_worker.submit(write_table, {k: list(v) for k, v in self._table.items()})
+        else:
+            io_worker.submit(append_launch, app_id, timestamp)
+
+        self.changed.emit()
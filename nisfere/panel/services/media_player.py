@@ -1,6 +1,7 @@
-from gi.repository import Playerctl
-from typing import Optional
+from gi.repository import Gio, Playerctl
+from typing import NamedTuple, Optional
 import gi
+import time
 import contextlib
 from loguru import logger
 
@@ -11,6 +12,35 @@ from utils.helpers import minutes_to_microseconds
 
 gi.require_version("Playerctl", "2.0")
 
+DEFAULT_DURATION = minutes_to_microseconds(5)
+
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+
+
+class TrackMetadata(NamedTuple):
+    """The parts of the MPRIS metadata the panel uses, unpacked once per change."""
+
+    track_id: str = ""
+    title: str = ""
+    artist: str = ""
+    album: str = ""
+    art_url: Optional[str] = None
+    length: int = 0  # microseconds, 0 when unknown
+
+    @classmethod
+    def from_variant(cls, variant) -> "TrackMetadata":
+        metadata = variant.unpack() if variant else {}
+        artist = metadata.get("xesam:artist") or ""
+        return cls(
+            track_id=str(metadata.get("mpris:trackid", "")),
+            title=metadata.get("xesam:title") or "",
+            artist=", ".join(artist) if isinstance(artist, list) else artist,
+            album=metadata.get("xesam:album") or "",
+            art_url=metadata.get("mpris:artUrl") or None,
+            length=int(metadata.get("mpris:length") or 0),
+        )
+
 
 class MediaPlayer(Service):
     """A service to manage a media player."""
@@ -26,36 +56,37 @@ class MediaPlayer(Service):
 
     @Property(str, flags="read-write")
     def player_name(self) -> str:
-        return self._player.get_property("player_name")
+        return self._player_name
+
+    @Property(str, flags="readable")
+    def player_instance(self) -> str:
+        """Unique per player, e.g. `chromium.instance1234`."""
+        return self._player_instance
+
+    @Property(object, flags="readable")
+    def metadata(self) -> TrackMetadata:
+        return self._metadata
 
     @Property(int, "read-write", default_value=0)
     def track_position(self) -> int:
-        return self._player.get_property("position")
+        return self.get_position()
 
     @track_position.setter
     def track_position(self, new_pos: int):
         self._player.set_position(new_pos)
+        self._sync_position(new_pos)
 
     @Property(str, flags="read-write")
     def album_image_url(self) -> str:
-        return self._player.get_property("metadata").unpack().get("mpris:artUrl", None)
+        return self._metadata.art_url
 
     @Property(int, flags="read-write")
     def track_duration(self) -> int:
-        default_duration = minutes_to_microseconds(5)
-        metadata = self._player.get_property("metadata").unpack()
-        duration = metadata.get(
-            "mpris:length", default_duration)  # Default: 5 minutes
-        return default_duration if duration == 0 else duration
+        return self._metadata.length or DEFAULT_DURATION
 
     @Property(str, flags="readable")
     def status(self) -> str:
-        return snake_case_to_kebab_case(
-            get_enum_member_name(
-                self._player.get_property("playback-status"),  # type: ignore
-                default="unknown",
-            )
-        )
+        return self._status
 
     @Property(str, flags="readable")
     def track(self) -> str:
@@ -63,11 +94,11 @@ class MediaPlayer(Service):
 
     @Property(str, flags="readable")
     def track_title(self) -> str:
-        return self._player.get_title()
+        return self._metadata.title
 
     @Property(str, flags="readable")
     def track_artist(self) -> str:
-        return self._player.get_artist()
+        return self._metadata.artist
 
     @Property(bool, "readable", default_value=False)
     def can_go_next(self) -> bool:
@@ -88,12 +119,32 @@ class MediaPlayer(Service):
     def __init__(self, player):
         super().__init__()
         self._player = player
+        self._player_name = player.get_property("player-name")
+        self._player_instance = player.get_property("player-instance")
         self._signal_connectors = {}
+        self._metadata = TrackMetadata.from_variant(player.get_property("metadata"))
+        self._status = self._read_status()
+        # the position is extrapolated from the last one the player reported,
+        # at the playback rate, which Playerctl doesn't expose
+        self._rate = 1.0
+        self._rate_proxy: Optional[Gio.DBusProxy] = None
+        self._rate_handler: Optional[int] = None
+        self._sync_position()
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SESSION,
+            Gio.DBusProxyFlags.DO_NOT_AUTO_START,
+            None,
+            f"org.mpris.MediaPlayer2.{self._player_instance}",
+            MPRIS_PATH,
+            MPRIS_PLAYER_INTERFACE,
+            None,
+            self._on_rate_proxy_ready,
+        )
 
         signals = {
-            "seeked": lambda *args: self.notify("track_position"),
+            "seeked": lambda _, position: self._on_seeked(position),
             "playback-status": lambda *args: self._on_playback_status_changed(),
-            "metadata": lambda *args: self._on_metadata_changed(),
+            "metadata": lambda _, metadata: self._on_metadata_changed(metadata),
             "exit": lambda *args: self._on_exit(),
         }
 
@@ -101,19 +152,83 @@ class MediaPlayer(Service):
             self._signal_connectors[signal_name] = self._player.connect(
                 signal_name, handler)
 
+    def _sync_position(self, position: Optional[int] = None):
+        """Rebase the extrapolation, querying the player when `position` isn't known."""
+        if position is None:
+            with contextlib.suppress(Exception):
+                position = self._player.get_position()
+        self._position = position or 0
+        self._position_time = time.monotonic()
+
+    def _on_rate_proxy_ready(self, _, result):
+        try:
+            proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except Exception as e:
+            return logger.warning(f"[MediaPlayer] Can't follow the rate of {self._player_instance}: {e}")
+        if not hasattr(self, "_player"):
+            return  # exited meanwhile
+        self._rate_proxy = proxy
+        self._rate_handler = proxy.connect("g-properties-changed", self._on_properties_changed)
+        self._set_rate(proxy.get_cached_property("Rate"))
+
+    def _on_properties_changed(self, _, changed, invalidated):
+        if "Rate" in changed.keys():
+            self._set_rate(changed.lookup_value("Rate", None))
+
+    def _set_rate(self, variant):
+        rate = variant.get_double() if variant is not None else 1.0
+        if rate == self._rate:
+            return
+        # rebase at the old rate first
+        self._sync_position()
+        self._rate = rate
+        self.notify("track_position")
+
+    def _on_seeked(self, position: int):
+        self._sync_position(position)
+        self.notify("track_position")
+
+    def _read_status(self) -> str:
+        return snake_case_to_kebab_case(
+            get_enum_member_name(
+                self._player.get_property("playback-status"),  # type: ignore
+                default="unknown",
+            )
+        )
+
     def _on_playback_status_changed(self):
+        self._sync_position()
+        self._status = self._read_status()
         self.notify("status")
         self.playback_status_changed.emit()
 
-    def _on_metadata_changed(self):
-        for prop in ["track_duration", "track_position", "track_title", "track_artist", "track", "album_image_url"]:
-            self.notify(prop)
+    def _on_metadata_changed(self, variant):
+        previous, self._metadata = self._metadata, TrackMetadata.from_variant(variant)
+        if previous == self._metadata:
+            return  # players resend unchanged metadata, e.g. on every seek
+
+        self._sync_position()
+        changed = {
+            "track_duration": previous.length != self._metadata.length,
+            "track_position": previous.track_id != self._metadata.track_id,
+            "track_title": previous.title != self._metadata.title,
+            "track_artist": previous.artist != self._metadata.artist,
+            "track": (previous.title, previous.artist) != (self._metadata.title, self._metadata.artist),
+            "album_image_url": previous.art_url != self._metadata.art_url,
+        }
+        for prop, has_changed in changed.items():
+            if has_changed:
+                self.notify(prop)
+        self.notify("metadata")
         self.metadata_changed.emit()
 
     def _on_exit(self):
         for signal_id in self._signal_connectors.values():
             with contextlib.suppress(Exception):
                 self._player.disconnect(signal_id)
+        if self._rate_proxy is not None:
+            self._rate_proxy.disconnect(self._rate_handler)
+            self._rate_proxy = None
         del self._player
         self.exit.emit()
 
@@ -129,8 +244,14 @@ class MediaPlayer(Service):
         if self.can_go_previous:
             self._player.previous()
 
-    def get_position(self):
-        return self._player.get_position() if self._player else 0
+    def get_position(self) -> int:
+        """Return the position in microseconds, without a D-Bus round trip."""
+        if not hasattr(self, "_player"):
+            return 0
+        if self.status != "playing":
+            return self._position
+        elapsed = int((time.monotonic() - self._position_time) * self._rate * 1_000_000)
+        return max(0, min(self._position + elapsed, self.track_duration))
 
 
 class MediaManager(Service):
@@ -148,21 +269,17 @@ class MediaManager(Service):
 
     @Property(list[MediaPlayer], "readable")
     def players(self) -> list[MediaPlayer]:
-        return self._players.values()
+        return list(self._players.values())
 
     @Property(MediaPlayer, "readable")
     def current_player(self) -> Optional[MediaPlayer]:
-        current_player = None
-        for player in self.players:
-            if player.status == "playing":
-                return player
-            current_player = player
-        return current_player
+        return self._current_player
 
     def __init__(self):
         super().__init__()
         self._manager = Playerctl.PlayerManager()
-        self._players: dict[str, MediaPlayer] = {}
+        self._players: dict[str, MediaPlayer] = {}  # by player instance
+        self._current_player: Optional[MediaPlayer] = None
 
         self._manager.connect("name-appeared", lambda _,
                               player: self._on_player_appeared(player=player))
@@ -172,24 +289,55 @@ class MediaManager(Service):
         for player in self._manager.get_property('player-names'):
             self._on_player_appeared(player=player)
 
+    def set_current_player(self, player: MediaPlayer):
+        """Make `player` the one shown and controlled by the panel."""
+        if player in self._players.values():
+            self._set_current_player(player)
+
+    def _set_current_player(self, player: Optional[MediaPlayer]):
+        if player is not self._current_player:
+            self._current_player = player
+            self.notify('current-player')
+
+    def _pick_current_player(self) -> Optional[MediaPlayer]:
+        """A playing player if there is one, else the latest to appear."""
+        current_player = None
+        for player in self._players.values():
+            if player.status == "playing":
+                return player
+            current_player = player
+        return current_player
+
+    def _on_player_status_changed(self, player: MediaPlayer):
+        if player.status == "playing":
+            # whatever started playing last is what the user is listening to
+            self._set_current_player(player)
+        elif player is self._current_player:
+            self._set_current_player(
+                next((p for p in self._players.values() if p.status == "playing"), player))
+
     def _on_player_appeared(self, player):
         """Callback when a new player appears"""
         player = Playerctl.Player.new_from_name(player)
-        player_name = player.get_property('player_name')
+        player_instance = player.get_property('player_instance')
 
-        logger.info(f"[Media] New player appeared: {player_name}")
+        logger.info(f"[Media] New player appeared: {player_instance}")
 
         self._manager.manage_player(player)
-        self._players[player_name] = MediaPlayer(
+        media_player = self._players[player_instance] = MediaPlayer(
             player=player
         )
-        self.notify('current-player')
+        media_player.connect(
+            "playback-status-changed", self._on_player_status_changed)
+        if not self._current_player or media_player.status == "playing":
+            self._set_current_player(media_player)
         self.player_appeared.emit()
 
     def _on_player_vanished(self, player):
         """Callback when a player disappears"""
-        player_name = player.get_property('player_name') or "Unknown"
-        logger.info(f"[Media] Player vanished: {player_name}")
-        self._players.pop(player_name)
-        self.notify('current-player')
+        player_instance = player.get_property('player_instance') or "Unknown"
+        logger.info(f"[Media] Player vanished: {player_instance}")
+        media_player = self._players.pop(player_instance, None)
+        if media_player is self._current_player:
+            self._set_current_player(self._pick_current_player())
         self.player_vanished.emit()
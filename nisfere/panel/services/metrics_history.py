@@ -0,0 +1,113 @@
+from typing import Any, Optional, Sequence
+
+from fabric.core.service import Service, Signal
+
+from services.system_metrics import SystemMetrics
+from utils.time_series import TimeSeries
+
+from gi.repository import GLib, Gtk
+
+
+class MetricsHistory(Service):
+    """A service recording recent system metrics as time series.
+
+    Series are named `cpu` (all CPUs), `cpu0`, `cpu1`..., `memory`,
+    `disk-read`, `disk-write`, `net-rx` and `net-tx` (all interfaces), and
+    `net-rx:<interface>`, `net-tx:<interface>`. Usages are percentages and
+    rates bytes per second.
+
+    Metrics are sampled at their own intervals and the latest values are
+    recorded every `resolution` ms, while a widget that `watch`es the
+    history is mapped, or all the time when `always` is set.
+    """
+
+    METRICS = ("cpu-cores", "memory", "disk-io", "network")
+
+    @Signal
+    def updated(self, metric: str) -> None: ...
+
+    def __init__(
+        self,
+        metrics: SystemMetrics,
+        resolution: int = 2000,
+        capacity: int = 120,
+        factors: Sequence[int] = (30,),
+        always: bool = False,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._metrics = metrics
+        self._resolution = resolution
+        self._capacity = capacity
+        self._factors = list(factors)
+        self._series: dict[str, TimeSeries] = {}
+        self._handlers = {
+            "cpu-cores": self._on_cpu_cores,
+            "memory": lambda value: self._push("memory", value),
+            "disk-io": self._on_disk_io,
+            "network": self._on_network,
+        }
+        self._latest: dict[str, Any] = {}
+        self._recorders = 0
+        self._timer: Optional[int] = None
+
+        if always:
+            for metric in self.METRICS:
+                metrics.subscribe(metric, lambda value, metric=metric: self._latest.__setitem__(metric, value))
+            self._start()
+
+    def watch(self, widget: Gtk.Widget):
+        """Record while `widget` is mapped."""
+        for metric in self.METRICS:
+            self._metrics.watch(
+                metric, widget, lambda value, metric=metric: self._latest.__setitem__(metric, value))
+        widget.connect("map", lambda *_: self._start())
+        widget.connect("unmap", lambda *_: self._stop())
+        if widget.get_mapped():
+            self._start()
+
+    def get_series(self, name: str) -> Optional[TimeSeries]:
+        return self._series.get(name)
+
+    def get_series_names(self, prefix: str = "") -> list[str]:
+        return [name for name in self._series if name.startswith(prefix)]
+
+    def _start(self):
+        self._recorders += 1
+        if self._recorders == 1:
+            self._timer = GLib.timeout_add(self._resolution, self._record)
+
+    def _stop(self):
+        self._recorders -= 1
+        if not self._recorders and self._timer is not None:
+            GLib.source_remove(self._timer)
+            self._timer = None
+            # don't record values from before the pause once resumed
+            self._latest.clear()
+
+    def _record(self) -> bool:
+        for metric, value in self._latest.items():
+            self._handlers[metric](value)
+            self.updated.emit(metric)
+        return True
+
+    def _push(self, name: str, value: float):
+        if (series := self._series.get(name)) is None:
+            series = self._series[name] = TimeSeries(self._resolution, self._capacity, self._factors)
+        series.push(value)
+
+    def _on_cpu_cores(self, usages: list[float]):
+        self._push("cpu", usages[0])
+        for core, usage in enumerate(usages[1:]):
+            self._push(f"cpu{core}", usage)
+
+    def _on_disk_io(self, rates: tuple[float, float]):
+        self._push("disk-read", rates[0])
+        self._push("disk-write", rates[1])
+
+    def _on_network(self, rates: dict[str, tuple[float, float]]):
+        for interface, (rx, tx) in rates.items():
+            self._push(f"net-rx:{interface}", rx)
+            self._push(f"net-tx:{interface}", tx)
+        self._push("net-rx", sum(rx for rx, _ in rates.values()))
+        self._push("net-tx", sum(tx for _, tx in rates.values()))
@@ -1,12 +1,69 @@
-from gi.repository import NM, GLib
+from gi.repository import NM, GLib, Gtk
 import gi
-from typing import List, Optional
+import time
+from typing import Callable, List, NamedTuple, Optional
 from fabric.core.service import Property, Service, Signal
 from fabric.utils import bulk_connect, get_enum_member_name, snake_case_to_kebab_case
 from loguru import logger
 
+from services.system_metrics import SystemMetrics
+
 gi.require_version("NM", "1.0")  # Ensure the correct version is loaded
 
+NETWORKS_UPDATE_DELAY = 500  # ms, scans add and update access points in bursts
+
+
+class NetworkRates(Service):
+    """A service smoothing the throughput of each network interface.
+
+    Rates come from the `network` metric of the system metrics service,
+    which reads `/proc/net/dev` once per tick for every interface and only
+    while something watches it. Each interface's rates are an exponentially
+    weighted moving average: `smoothing` is the weight of the newest sample.
+    """
+
+    def __init__(self, metrics: SystemMetrics, smoothing: float = 0.5, **kwargs):
+        super().__init__(**kwargs)
+        self._metrics = metrics
+        self._smoothing = smoothing
+        self._reset_after = 3  # missed samples
+        self._sample: Optional[dict] = None
+        self._sample_time = 0.0
+        self._rates: dict[str, tuple[float, float]] = {}
+
+    def get_rates(self, iface: str) -> tuple[float, float]:
+        """Return the smoothed bytes per second received and sent on `iface`."""
+        return self._rates.get(iface, (0.0, 0.0))
+
+    def watch(self, iface: str, widget: Gtk.Widget, callback: Callable[[float, float], None]) -> int:
+        """Call `callback` with the rates of `iface` on each sample while `widget` is mapped."""
+        return self._metrics.watch(
+            "network", widget, lambda rates: callback(*self._update(rates).get(iface, (0.0, 0.0))))
+
+    def unwatch(self, handle: int):
+        self._metrics.unwatch(handle)
+
+    def _update(self, sample: dict[str, tuple[float, float]]) -> dict[str, tuple[float, float]]:
+        # every watcher gets the same sample, only average it in once
+        if sample is self._sample:
+            return self._rates
+        now = time.monotonic()
+        interval = self._metrics.get_interval("network") / 1000
+        if now - self._sample_time > self._reset_after * interval:
+            # sampling was paused, the old average is stale
+            self._rates = {}
+        self._sample, self._sample_time = sample, now
+
+        weight = self._smoothing
+        rates = {}
+        for iface, (rx, tx) in sample.items():
+            if previous := self._rates.get(iface):
+                rx = weight * rx + (1 - weight) * previous[0]
+                tx = weight * tx + (1 - weight) * previous[1]
+            rates[iface] = (rx, tx)
+        self._rates = rates
+        return rates
+
 
 class NetworkClient(Service):
     """A service to manage network devices"""
@@ -253,9 +310,7 @@ class AccessPoint(Service):
 
     @Property(bool, "readable", default_value=False)
     def is_active(self) -> bool:
-        if self._device.active_access_point:
-            return self.bssid == self._device.active_access_point.get_bssid()
-        return False
+        return self._device.active_access_point is self
 
     def __init__(self, device: "Wifi", ap: NM.AccessPoint, **kwargs):
         super().__init__(**kwargs)
@@ -263,28 +318,33 @@ class AccessPoint(Service):
         self._device: Wifi = device
         self._ap: NM.AccessPoint = ap
 
-        self._ap.connect("notify::strength",
-                         lambda *args: self.notifier("strength"))
-        self._device.connect("notify::active-access-point",
-                             lambda *args: self.notifier("is-active"))
-
     def notifier(self, name: str, *args):
         self.notify(name)
         self.emit("changed")
         return
 
 
+class NetworksDiff(NamedTuple):
+    added: list[AccessPoint]  # shown for networks that just appeared
+    removed: list[str]  # ssids of networks that are gone
+    changed: list[AccessPoint]  # shown for networks whose access points changed
+
+
 class Wifi(Service):
-    """A service to manage wifi devices"""
+    """A service to manage wifi devices
 
-    @Signal
-    def changed(self) -> None: ...
+    Access points are kept by BSSID and grouped into networks by SSID; each
+    network is shown as its active access point, or else its strongest one.
+    Access points added, removed or changing strength are collected and
+    applied together after `NETWORKS_UPDATE_DELAY`, emitting a single
+    `networks-changed` with what changed.
+    """
 
     @Signal
-    def ap_added(self, ap: AccessPoint) -> None: ...
+    def changed(self) -> None: ...
 
     @Signal
-    def ap_removed(self, ap: AccessPoint) -> None: ...
+    def networks_changed(self, diff: object) -> None: ...
 
     @Property(NetworkClient, "readable")
     def client(self) -> NetworkClient:
@@ -302,18 +362,29 @@ class Wifi(Service):
 
     @Property(list[AccessPoint], "readable")
     def access_points(self) -> list[AccessPoint]:
-        return sorted(self._access_points.values(), key=lambda x: x.is_active, reverse=True)
+        """The access point shown for each network, active first, then by strength."""
+        return self._sorted_networks
 
     @Property(AccessPoint, "readable")
     def active_access_point(self) -> Optional[AccessPoint]:
         return self._active_access_point
 
+    @Property(str, "readable")
+    def iface(self) -> str:
+        return self._device.get_iface() if self._device else None
+
     def __init__(self, client: NetworkClient, device: NM.DeviceWifi, **kwargs):
         super().__init__(**kwargs)
         self._client: NetworkClient = client
         self._device: NM.DeviceWifi = device
-        self._active_access_point: NM.AccessPoint | None = None
-        self._access_points: dict[str, AccessPoint] = {}
+        self._active_access_point: AccessPoint | None = None
+        self._access_points: dict[str, AccessPoint] = {}  # by bssid
+        self._strength_handlers: dict[str, int] = {}  # by bssid
+        self._bssids: dict[str, set[str]] = {}  # by ssid
+        self._networks: dict[str, AccessPoint] = {}  # shown access point by ssid
+        self._sorted_networks: list[AccessPoint] = []
+        self._dirty_networks: set[str] = set()
+        self._update_id: int | None = None
 
         bulk_connect(
             self._device,
@@ -332,6 +403,7 @@ class Wifi(Service):
             self.on_access_point_added(ap=ap)
 
         self.on_access_point_activated()
+        self._flush_networks()
 
     def on_state_changed(self, state):
         self.emit("changed")
@@ -340,49 +412,97 @@ class Wifi(Service):
         return self._device.get_access_points()
 
     def on_access_point_added(self, ap):
-        ssid = ap.get_ssid()
-        ssid = NM.utils_ssid_to_utf8(ssid.get_data()) if ssid else "Unknown"
+        bssid = ap.get_bssid()
+        if not bssid or bssid in self._access_points:
+            return
 
         access_point: AccessPoint = AccessPoint(
             ap=ap,
             device=self
         )
+        ssid = access_point.ssid
 
-        self._access_points[ssid] = access_point
-
-        self.ap_added.emit(access_point)
+        self._access_points[bssid] = access_point
+        self._bssids.setdefault(ssid, set()).add(bssid)
+        self._strength_handlers[bssid] = ap.connect(
+            "notify::strength", lambda *args: self.queue_network_update(ssid))
+        self.queue_network_update(ssid)
 
-        # self.notifier("access-points")
-
-        logger.info(f"[Wifi] New access point added with ssid: {ssid}")
+        logger.info(f"[Wifi] New access point {bssid} added with ssid: {ssid}")
 
     def on_access_point_removed(self, ap):
-        ssid = ap.get_ssid()
-        ssid = NM.utils_ssid_to_utf8(ssid.get_data()) if ssid else "Unknown"
+        bssid = ap.get_bssid()
 
-        if not (access_point := self._access_points.pop(ssid, None)):
+        if not (access_point := self._access_points.pop(bssid, None)):
             return logger.warning(
-                f"[Network] tried to remove a unknwon access point with ssid {ssid}"
+                f"[Network] tried to remove a unknwon access point {bssid}"
             )
 
-        self.ap_removed.emit(access_point)
+        ap.disconnect(self._strength_handlers.pop(bssid))
+        ssid = access_point.ssid
+        bssids = self._bssids[ssid]
+        bssids.discard(bssid)
+        if not bssids:
+            del self._bssids[ssid]
+        self.queue_network_update(ssid)
 
-        logger.info(f"[Wifi] Access point with ssid: {ssid} removed.")
+        logger.info(f"[Wifi] Access point {bssid} with ssid: {ssid} removed.")
 
     def on_access_point_activated(self):
-        if self._device.get_active_access_point():
-            self._active_access_point: AccessPoint = AccessPoint(
-                ap=self._device.get_active_access_point(),
-                device=self
-            )
+        previous = self._active_access_point
 
+        if ap := self._device.get_active_access_point():
+            self.on_access_point_added(ap=ap)
+            self._active_access_point = self._access_points.get(ap.get_bssid())
         else:
             self._active_access_point = None
 
+        for access_point in (previous, self._active_access_point):
+            if access_point:
+                access_point.notifier("is-active")
+                self.queue_network_update(access_point.ssid)
+
         self.notifier("active-access-point")
 
         logger.info("[Wifi] New active connection")
 
+    def queue_network_update(self, ssid: str):
+        self._dirty_networks.add(ssid)
+        # not restarted by later changes, strengths keep changing during a scan
+        if self._update_id is None:
+            self._update_id = GLib.timeout_add(NETWORKS_UPDATE_DELAY, self._flush_networks)
+
+    def _flush_networks(self) -> bool:
+        if self._update_id is not None:
+            GLib.source_remove(self._update_id)
+            self._update_id = None
+
+        dirty, self._dirty_networks = self._dirty_networks, set()
+        if not dirty:
+            return False
+        added, removed, changed = [], [], []
+        for ssid in dirty:
+            if not (bssids := self._bssids.get(ssid)):
+                if self._networks.pop(ssid, None):
+                    removed.append(ssid)
+                continue
+
+            shown = max(
+                (self._access_points[bssid] for bssid in bssids),
+                key=lambda access_point: (access_point.is_active, access_point.strength),
+            )
+            (changed if ssid in self._networks else added).append(shown)
+            self._networks[ssid] = shown
+
+        self._sorted_networks = sorted(
+            self._networks.values(),
+            key=lambda access_point: (access_point.is_active, access_point.strength),
+            reverse=True,
+        )
+        self.networks_changed.emit(NetworksDiff(added, removed, changed))
+        self.notify("access-points")
+        return False
+
     def disconnect_wifi(self):
         """Disconnect from the current WiFi network."""
         active_connection = self._device.get_active_connection()
@@ -394,7 +514,7 @@ class Wifi(Service):
             None,
             lambda device, result: [
                 device.request_scan_finish(result),
-                self.notifier('access-points'),
+                self._flush_networks(),
             ],
         )
         logger.info("[Wifi] Scan started")
@@ -577,15 +697,3 @@ class Ethernet(Service):
             self._active_connection = active_connection
             self._active_connection.connect(
                 "state-changed", lambda *args: self.emit('changed'))
-
-    def get_network_stats(self):
-        """Fetch received and transmitted bytes from the system files"""
-        try:
-            # Read data from /sys/class/net for accurate speed
-            with open(f"/sys/class/net/{self.iface}/statistics/rx_bytes", "r") as rx_file:
-                rx_bytes = int(rx_file.read().strip())
-            with open(f"/sys/class/net/{self.iface}/statistics/tx_bytes", "r") as tx_file:
-                tx_bytes = int(tx_file.read().strip())
-            return rx_bytes, tx_bytes
-        except FileNotFoundError:
-            return None, None
@@ -1,18 +1,25 @@
 import gi
 import json
-import os
-from typing import List, Optional
+import time
+from collections import Counter
+from typing import Callable, List, Optional
 from loguru import logger
 
 from fabric.core.service import Signal, Property, Service
 from fabric.notifications import Notifications, Notification, NotificationImagePixmap, NotificationAction
 
 from utils.config import CONFIG
+from utils.journal import JournalStore
+from utils.blob_store import BlobStore
+from utils.app_search import tokenize, PREFIX_LENGTH
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gio, GLib, GdkPixbuf
 
 
 NOTIFICATION_CACHE_FILE = CONFIG["notifications-cache-file-path"]
+EXPIRE_CHECK_INTERVAL = 60 * 60  # seconds
+
+notification_images = BlobStore(CONFIG["notifications-images-folder"])
 
 
 class CachedNotification(Service):
@@ -24,6 +31,9 @@ class CachedNotification(Service):
         Service.__init__(self, **kwargs)
         self._notification = Notification.deserialize(data)
         self.cache_id = data['cached-id']
+        self._image_blob = data.get('image-blob')
+        self._cached_at = data.get('cached-at', time.time())
+        self._read = data.get('read', False)
         return self
 
     @Signal
@@ -79,16 +89,41 @@ class CachedNotification(Service):
 
     @Property(GdkPixbuf.Pixbuf, "readable")
     def image_pixbuf(self) -> GdkPixbuf.Pixbuf:
+        if self._image_blob:
+            # decoded on use, widgets keep scaled copies in the pixbuf cache
+            return notification_images.load_pixbuf(self._image_blob)
         if self.image_pixmap:
             return self.image_pixmap.as_pixbuf()
         if self.image_file:
             return GdkPixbuf.Pixbuf.new_from_file(self.image_file)
         return None  # type: ignore
 
+    @Property(float, "readable")
+    def cached_at(self) -> float:
+        return self._cached_at
+
+    @Property(bool, "read-write", default_value=False)
+    def read(self) -> bool:
+        return self._read
+
+    @read.setter
+    def read(self, value: bool):
+        self._read = value
+
+    @Property(str, "readable")
+    def image_blob(self) -> Optional[str]:
+        return self._image_blob
+
+    @Property(bool, "readable", default_value=False)
+    def has_image(self) -> bool:
+        return bool(self._image_blob or self.image_pixmap or self.image_file)
+
     @Property(dict, "readable")
     def serialized(self) -> dict:
         return {
             "cached-id": self.cache_id,
+            "cached-at": self.cached_at,
+            "read": self._read,
             "id": self.id,
             "replaces-id": self.replaces_id,
             "app-name": self.app_name,
@@ -98,15 +133,28 @@ class CachedNotification(Service):
             "urgency": self.urgency,
             "actions": [(action.identifier, action.label) for action in self.actions],
             "image-file": self.image_file,
-            "image-pixmap": self.image_pixmap.serialize()
-            if self.image_pixmap
-            else None,
+            # pixels live in the blob store, only the reference is cached
+            "image-blob": self._image_blob,
+            "image-pixmap": None,
         }
 
-    def __init__(self, notification: Notification, cache_id: int, **kwargs):
+    def __init__(
+        self,
+        notification: Notification,
+        cache_id: int,
+        on_image_stored: Optional[Callable[[str, int], None]] = None,
+        **kwargs,
+    ):
         super().__init__()
         self._notification: Notification = notification
         self._cache_id = cache_id
+        self._cached_at = time.time()
+        self._read = False
+        self._image_blob = (
+            notification_images.put_pixbuf(notification.image_pixmap.as_pixbuf(), on_image_stored)
+            if notification.image_pixmap
+            else None
+        )
 
     def remove_from_cache(self):
         self.removed_from_cache.emit()
@@ -140,6 +188,28 @@ class CachedNotifications(Notifications):
         """Return the count of notifications."""
         return self._count
 
+    @Property(int, "readable")
+    def unread_count(self) -> int:
+        """Return the count of notifications not seen in the menu yet."""
+        return len(self._unread)
+
+    @Property(list[str], "readable")
+    def app_names(self) -> list[str]:
+        """Return the apps with cached notifications, most recent last."""
+        return sorted(self._app_index, key=lambda app: next(reversed(self._app_index[app])))
+
+    @Property(dict, "readable")
+    def stats(self) -> dict:
+        """Return the size of the history and how much was evicted."""
+        return {
+            "entries": self._count,
+            "bytes": self._total_bytes,
+            "image-bytes": self._blob_bytes,
+            "evicted": self._evicted,
+            "next-id": self._next_id,
+            "per-app": {app: len(ids) for app, ids in self._app_index.items()},
+        }
+
     @Property(bool, "read-write", default_value=False)
     def dont_disturb(self) -> bool:
         """Return the pause status."""
@@ -157,31 +227,68 @@ class CachedNotifications(Notifications):
         self._signal_handlers = {}  # Store signal handlers by notification_id
         self._dont_disturb = False
         self._count = 0
+        # cache ids only ever grow, so removals can't make them collide
+        self._next_id = 1
+        self._sizes: dict[int, int] = {}
+        self._total_bytes = 0
+        # images are shared by content, they're counted and deleted once unused
+        self._blob_refs: Counter[str] = Counter()
+        self._blob_sizes: dict[str, int] = {}
+        self._unsized_blobs: set[str] = set()  # still being written
+        self._blob_bytes = 0
+        self._app_index: dict[str, dict[int, None]] = {}  # app -> ids, oldest first
+        self._urgency_index: dict[int, dict[int, None]] = {}
+        self._unread: dict[int, None] = {}
+        self._word_index: dict[str, set[int]] = {}  # word prefixes -> ids
+        self._words: dict[int, set[str]] = {}
+        self._evicted = 0
+        self._retention = CONFIG["notifications-retention"]
+        self._store = JournalStore(NOTIFICATION_CACHE_FILE, key="cached-id")
 
         self.load_cached_notifications()
 
+        GLib.timeout_add_seconds(EXPIRE_CHECK_INTERVAL, self._on_expire_check)
+
     def load_cached_notifications(self) -> dict[int, CachedNotification]:
-        """Load cached notifications from a JSON file (deserialization)."""
-        with open(NOTIFICATION_CACHE_FILE, "r") as file:
-            data = json.load(file)  # Load list of serialized notifications
+        """Load cached notifications from the snapshot and its journal (deserialization)."""
+        data = sorted(self._store.load().values(), key=lambda n: n['cached-id'])
+        migrated = False
 
         for notification in data:
-            cached_notification = CachedNotification.create_from_dict(
-                notification)
-            handler_id = cached_notification.connect(
-                'removed-from-cache', lambda *args: self.remove_cached_notification(notification_id=cached_notification.cache_id))
-            self._signal_handlers[cached_notification.cache_id] = handler_id
-            self._cached_notifications[cached_notification.cache_id] = cached_notification
-            self._count += 1
+            if notification.get('image-pixmap') and not notification.get('image-blob'):
+                # caches written before images moved out of line
+                cached_notification = CachedNotification(
+                    notification=Notification.deserialize({**notification, 'timeout': 0}),
+                    cache_id=notification['cached-id'],
+                    on_image_stored=self._on_image_stored)
+                self._store.records[cached_notification.cache_id] = cached_notification.serialized
+                migrated = True
+            else:
+                cached_notification = CachedNotification.create_from_dict(
+                    notification)
+            self._track(cached_notification, self._store.records[cached_notification.cache_id])
+            self._next_id = max(self._next_id, cached_notification.cache_id + 1)
+
+        if migrated:
+            self._store.compact()
+
+        self.enforce_retention()
+        notification_images.collect(
+            {n.image_blob for n in self._cached_notifications.values() if n.image_blob})
 
         self.notify('count')
 
+    def get_cached_notification(self, cache_id: int) -> Optional[CachedNotification]:
+        """Return the cached notification of given id, if it is still cached."""
+        return self._cached_notifications.get(cache_id)
+
     def cache_notifications(self) -> None:
-        """Save cached notifications to a JSON file."""
-        serialized_data = [notif.serialized for notif in self._cached_notifications.values(
-        )]  # Convert to serializable format
-        with open(NOTIFICATION_CACHE_FILE, "w") as file:
-            json.dump(serialized_data, file, indent=4)
+        """Compact the journal into a fresh snapshot of the cached notifications."""
+        self._store.compact()
+
+    def close(self) -> None:
+        """Write out journal entries still waiting for their batch, before quitting."""
+        self._store.close()
 
     def clear_all_cached_notifications(self):
         """Empty the notifications."""
@@ -191,9 +298,23 @@ class CachedNotifications(Notifications):
             if handler_id:
                 cached_notification.disconnect(handler_id)
         self._cached_notifications = {}
-        self.cache_notifications()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._blob_refs = Counter()
+        self._blob_sizes = {}
+        self._unsized_blobs = set()
+        self._blob_bytes = 0
+        self._app_index = {}
+        self._urgency_index = {}
+        self._unread = {}
+        self._word_index = {}
+        self._words = {}
+        self._store.clear()
+        notification_images.collect(set())
         self._count = 0
         self.notify('count')
+        self.notify('unread-count')
+        self.notify('stats')
         self.clear_all.emit()
 
     def notification_added(self, notification_id: int) -> None:
@@ -203,34 +324,214 @@ class CachedNotifications(Notifications):
         notification = self.get_notification_from_id(notification_id)
 
         if notification and not self._dont_disturb:
-            self._count += 1
-            notification_id = self._count
+            notification_id = self._next_id
+            self._next_id += 1
 
             cached_notification = CachedNotification(
-                notification=notification, cache_id=notification_id)
-            handler_id = cached_notification.connect(
-                'removed-from-cache', lambda *args: self.remove_cached_notification(notification_id=notification_id))
+                notification=notification, cache_id=notification_id,
+                on_image_stored=self._on_image_stored)
+            record = cached_notification.serialized
 
-            self._signal_handlers[notification_id] = handler_id
-            self._cached_notifications[notification_id] = cached_notification
-            self.cache_notifications()
+            self._track(cached_notification, record)
+            self._store.add(record)
 
             self.notify('count')
+            self.notify('unread-count')
+            self.notify('stats')
             self.emit("cached-notification-added", cached_notification)
 
+            self.enforce_retention()
+
     def remove_cached_notification(self, notification_id: int):
         """Remove the notification of given id."""
         if notification_id in self._cached_notifications:
-            cached_notification = self._cached_notifications.pop(
-                notification_id)  # Remove from cache
-            self.cache_notifications()  # Update JSON
-            self._count -= 1
+            cached_notification = self._untrack(notification_id)  # Remove from cache
+            self._store.remove(notification_id)  # Journal the removal
             self.notify('count')
+            self.notify('unread-count')
+            self.notify('stats')
             # Get the stored signal handler ID and disconnect it
             handler_id = self._signal_handlers.pop(notification_id, None)
             if handler_id:
                 # Disconnect the signal handler
                 cached_notification.disconnect(handler_id)
+            self.emit("cached-notification-removed", cached_notification)
+
+    def get_by_app(self, app_name: str) -> list[CachedNotification]:
+        """Return the notifications of `app_name`, oldest first."""
+        return [self._cached_notifications[i] for i in self._app_index.get(app_name, ())]
+
+    def get_by_urgency(self, urgency: int) -> list[CachedNotification]:
+        """Return the notifications of given urgency, oldest first."""
+        return [self._cached_notifications[i] for i in self._urgency_index.get(urgency, ())]
+
+    def get_unread(self) -> list[CachedNotification]:
+        """Return the notifications not marked as read, oldest first."""
+        return [self._cached_notifications[i] for i in self._unread]
+
+    def search(self, text: str) -> list[CachedNotification]:
+        """Return the notifications with words starting with every word of `text`, oldest first."""
+        matches: Optional[set[int]] = None
+        for word in tokenize(text):
+            ids = self._word_index.get(word[:PREFIX_LENGTH], set())
+            if len(word) > PREFIX_LENGTH:
+                ids = {i for i in ids if any(w.startswith(word) for w in self._words[i])}
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        if matches is None:
+            return list(self._cached_notifications.values())
+        return [self._cached_notifications[i] for i in sorted(matches)]
+
+    def mark_all_read(self):
+        """Mark every notification as read."""
+        if not self._unread:
+            return
+        for cache_id in self._unread:
+            cached_notification = self._cached_notifications[cache_id]
+            cached_notification.read = True
+            record = cached_notification.serialized
+            self._total_bytes += len(json.dumps(record)) - self._sizes[cache_id]
+            self._sizes[cache_id] = len(json.dumps(record))
+            self._store.add(record)
+        self._unread = {}
+        self.notify('unread-count')
+
+    def enforce_retention(self):
+        """Evict notifications that exceed the retention policy, oldest first."""
+        now = time.time()
+        ttl = self._retention["ttl"]
+        per_app = self._retention["max-per-app"]
+        to_evict: dict[int, None] = {}
+
+        if ttl:
+            for cache_id, notification in self._cached_notifications.items():
+                if now - notification.cached_at < ttl:
+                    break  # insertion order is age order
+                to_evict[cache_id] = None
+
+        if per_app:
+            for ids in self._app_index.values():
+                excess = len(ids) - per_app
+                for cache_id in ids:
+                    if excess <= 0:
+                        break
+                    if cache_id not in to_evict:
+                        to_evict[cache_id] = None
+                        excess -= 1
+
+        released: Counter[str] = Counter()
+
+        def freed_bytes(cache_id: int) -> int:
+            # an image only frees its bytes with the last notification using it
+            size = self._sizes[cache_id]
+            if blob := self._cached_notifications[cache_id].image_blob:
+                released[blob] += 1
+                if released[blob] == self._blob_refs[blob]:
+                    size += self._blob_sizes.get(blob, 0)
+            return size
+
+        entries = self._count - len(to_evict)
+        total_bytes = self._total_bytes + self._blob_bytes - sum(freed_bytes(i) for i in to_evict)
+        for cache_id in self._cached_notifications:
+            if (
+                entries <= self._retention["max-entries"]
+                and total_bytes <= self._retention["max-bytes"]
+            ):
+                break
+            if cache_id in to_evict:
+                continue
+            to_evict[cache_id] = None
+            entries -= 1
+            total_bytes -= freed_bytes(cache_id)
+
+        for cache_id in to_evict:
+            if notification := self._cached_notifications.get(cache_id):
+                self._evicted += 1
+                # goes through removed-from-cache so open widgets close too
+                notification.remove_from_cache()
+
+        if to_evict:
+            logger.info(f"[Notifications] Evicted {len(to_evict)} cached notifications")
+
+    def _track(self, cached_notification: CachedNotification, record: dict):
+        cache_id = cached_notification.cache_id
+        handler_id = cached_notification.connect(
+            'removed-from-cache', lambda *args: self.remove_cached_notification(notification_id=cache_id))
+        self._signal_handlers[cache_id] = handler_id
+        self._cached_notifications[cache_id] = cached_notification
+        self._sizes[cache_id] = len(json.dumps(record))
+        self._total_bytes += self._sizes[cache_id]
+        self._app_index.setdefault(cached_notification.app_name, {})[cache_id] = None
+        self._urgency_index.setdefault(cached_notification.urgency, {})[cache_id] = None
+        if blob := cached_notification.image_blob:
+            self._ref_blob(blob)
+        if not cached_notification.read:
+            self._unread[cache_id] = None
+        words = set(tokenize(
+            f"{cached_notification.app_name} {cached_notification.summary} {cached_notification.body}"))
+        self._words[cache_id] = words
+        for word in words:
+            for length in range(1, min(len(word), PREFIX_LENGTH) + 1):
+                self._word_index.setdefault(word[:length], set()).add(cache_id)
+        self._count += 1
+
+    def _untrack(self, cache_id: int) -> CachedNotification:
+        cached_notification = self._cached_notifications.pop(cache_id)
+        self._total_bytes -= self._sizes.pop(cache_id, 0)
+        app_ids = self._app_index.get(cached_notification.app_name, {})
+        app_ids.pop(cache_id, None)
+        if not app_ids:
+            self._app_index.pop(cached_notification.app_name, None)
+        urgency_ids = self._urgency_index.get(cached_notification.urgency, {})
+        urgency_ids.pop(cache_id, None)
+        if not urgency_ids:
+            self._urgency_index.pop(cached_notification.urgency, None)
+        self._unread.pop(cache_id, None)
+        if blob := cached_notification.image_blob:
+            self._unref_blob(blob)
+        for word in self._words.pop(cache_id, ()):
+            for length in range(1, min(len(word), PREFIX_LENGTH) + 1):
+                prefix_ids = self._word_index.get(word[:length])
+                if prefix_ids is not None:
+                    prefix_ids.discard(cache_id)
+                    if not prefix_ids:
+                        del self._word_index[word[:length]]
+        self._count -= 1
+        return cached_notification
+
+    def _ref_blob(self, blob: str):
+        self._blob_refs[blob] += 1
+        if self._blob_refs[blob] > 1:
+            return
+        if (size := notification_images.size(blob)) is None:
+            self._unsized_blobs.add(blob)
+        else:
+            self._blob_sizes[blob] = size
+            self._blob_bytes += size
+
+    def _unref_blob(self, blob: str):
+        self._blob_refs[blob] -= 1
+        if self._blob_refs[blob] > 0:
+            return
+        del self._blob_refs[blob]
+        self._unsized_blobs.discard(blob)
+        self._blob_bytes -= self._blob_sizes.pop(blob, 0)
+        notification_images.delete(blob)
+
+    def _on_image_stored(self, blob: str, size: int):
+        # images are written on the worker, their size comes in afterwards
+        if blob not in self._unsized_blobs:
+            return
+        self._unsized_blobs.discard(blob)
+        self._blob_sizes[blob] = size
+        self._blob_bytes += size
+        self.notify('stats')
+        self.enforce_retention()
+
+    def _on_expire_check(self) -> bool:
+        self.enforce_retention()
+        return True
 
     def toggle_dnd(self):
         self.dont_disturb = not self.dont_disturb
@@ -7,6 +7,7 @@ from utils.config import CONFIG
 from utils.helpers import run_command_with_output
 from fabric.utils import invoke_repeater, exec_shell_command_async
 from fabric.core import Service, Property, Signal
+from services.hyprland_ipc import HyprlandIPC
 from gi.repository import Gio, GLib, Gtk, Notify
 
 class Screenshot(Service):
@@ -14,8 +15,9 @@ class Screenshot(Service):
     @Signal
     def screenshot_saved(self) -> None: ...
 
-    def __init__(self):
+    def __init__(self, ipc: HyprlandIPC):
         super().__init__()
+        self._ipc = ipc
         self._screenshots_folder = CONFIG["screenshots-folder"]
 
     def _generate_filename(self):
@@ -35,10 +37,13 @@ class Screenshot(Service):
 
     def capture_window(self, *args):
         self.screenshot_saved.emit()
-        GLib.timeout_add(
-            500,
-            lambda: self._capture(
-                "grim -c -o \"$(hyprctl activeworkspace -j | jq -r '.monitor')\""
+        self._ipc.send_json(
+            "activeworkspace",
+            lambda workspace: GLib.timeout_add(
+                500,
+                lambda: self._capture(
+                    f"grim -c -o \"{workspace.get('monitor', '')}\""
+                ),
             ),
         )
 
@@ -0,0 +1,193 @@
+import time
+from typing import Any, Callable, Optional
+from loguru import logger
+
+from fabric.core.service import Service
+
+from utils import procfs
+from utils.io_worker import IOWorker
+from utils.process_table import ProcessTable
+
+from gi.repository import GLib, Gtk
+
+DEFAULT_INTERVALS = {  # ms
+    "time": 1000,
+    "cpu": 2000,
+    "cpu-cores": 2000,
+    "memory": 2000,
+    "disk": 30 * 1000,
+    "disk-io": 2000,
+    "network": 2000,
+    "processes": 3000,
+    "uptime": 60 * 1000,
+}
+
+
+class SystemMetrics(Service):
+    """A service sampling system metrics for the widgets that show them.
+
+    Widgets `watch` a metric for as long as they are mapped. A metric is
+    only sampled while at least one of its watchers is on screen, each at
+    its own interval, and the sampling (reads of `/proc` and `statvfs`)
+    runs on a worker thread; values are delivered on the main loop.
+    Consumers that aren't widgets `subscribe` and keep their metric
+    sampled until they `unwatch`.
+
+    `cpu-cores` is a list of usages: all CPUs together, then each core.
+    `disk-io` is the bytes per second read and written, `network` maps each
+    interface to the bytes per second received and sent. `processes` maps
+    `cpu` and `memory` to the top processes by that usage.
+    """
+
+    def __init__(self, intervals: Optional[dict[str, int]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._worker = IOWorker("nisfere-metrics")
+        self._intervals = {**DEFAULT_INTERVALS, **(intervals or {})}
+        self._samplers: dict[str, Callable[[], Any]] = {
+            "time": time.localtime,
+            "cpu": self._sample_cpu,
+            "cpu-cores": self._sample_cpu_cores,
+            "memory": procfs.memory_percent,
+            "disk": lambda: procfs.disk_percent("/"),
+            "disk-io": lambda: (self._rates("disk-io", {"disk": procfs.read_disk_bytes()}) or {}).get("disk"),
+            "network": lambda: self._rates("network", procfs.read_net_dev()),
+            "processes": lambda: self._processes.sample(),
+            "uptime": procfs.read_uptime,
+        }
+        self._watchers: dict[int, tuple[str, Callable[[Any], None]]] = {}
+        self._active: dict[str, set[int]] = {metric: set() for metric in self._samplers}
+        self._timers: dict[str, int] = {}
+        self._values: dict[str, Any] = {}
+        self._in_flight: set[str] = set()
+        self._next_handle = 0
+        self._cpu_times: Optional[tuple[int, int]] = None
+        self._core_times: Optional[list[tuple[int, int]]] = None
+        self._counters: dict[str, tuple[float, dict]] = {}  # for rates, by metric
+        self._processes = ProcessTable()
+
+    def get_interval(self, metric: str) -> int:
+        return self._intervals[metric]
+
+    def get_value(self, metric: str) -> Any:
+        """Return the last sample of `metric`, if any."""
+        return self._values.get(metric)
+
+    def watch(self, metric: str, widget: Gtk.Widget, callback: Callable[[Any], None]) -> int:
+        """Call `callback` with each sample of `metric` while `widget` is mapped."""
+        handle = self._add_watcher(metric, callback)
+        widget.connect("map", lambda *_: self._resume(handle))
+        widget.connect("unmap", lambda *_: self._pause(handle))
+        widget.connect("destroy", lambda *_: self.unwatch(handle))
+        if widget.get_mapped():
+            self._resume(handle)
+        return handle
+
+    def subscribe(self, metric: str, callback: Callable[[Any], None]) -> int:
+        """Call `callback` with each sample of `metric` until `unwatch`ed."""
+        handle = self._add_watcher(metric, callback)
+        self._resume(handle)
+        return handle
+
+    def _add_watcher(self, metric: str, callback: Callable[[Any], None]) -> int:
+        if metric not in self._samplers:
+            raise ValueError(f"Unknown metric {metric}")
+        handle = self._next_handle
+        self._next_handle += 1
+        self._watchers[handle] = (metric, callback)
+        return handle
+
+    def unwatch(self, handle: int):
+        self._pause(handle)
+        self._watchers.pop(handle, None)
+
+    def _resume(self, handle: int):
+        if handle not in self._watchers:
+            return
+        metric, callback = self._watchers[handle]
+        active = self._active[metric]
+        if handle in active:
+            return
+        active.add(handle)
+
+        if metric in self._values:
+            callback(self._values[metric])
+        if len(active) == 1:
+            self._sample(metric)
+            self._timers[metric] = GLib.timeout_add(
+                self._intervals[metric], self._sample, metric)
+
+    def _pause(self, handle: int):
+        if handle not in self._watchers:
+            return
+        metric, _ = self._watchers[handle]
+        active = self._active[metric]
+        active.discard(handle)
+        if not active and (timer := self._timers.pop(metric, None)):
+            GLib.source_remove(timer)
+            # queued behind the samples, so it can't race with them
+            self._worker.submit(self._reset_baseline, metric)
+
+    def _sample(self, metric: str) -> bool:
+        if metric not in self._in_flight:
+            self._in_flight.add(metric)
+            self._worker.submit(
+                self._run_sampler,
+                metric,
+                callback=lambda value: self._deliver(metric, value),
+            )
+        return True
+
+    def _run_sampler(self, metric: str) -> Any:
+        # never raises, the metric stays in flight until its callback runs
+        try:
+            return self._samplers[metric]()
+        except Exception as e:
+            logger.warning(f"[SystemMetrics] Could not sample {metric}: {e}")
+            return None
+
+    def _deliver(self, metric: str, value: Any):
+        self._in_flight.discard(metric)
+        if value is None:
+            return
+        self._values[metric] = value
+        for handle in list(self._active[metric]):
+            self._watchers[handle][1](value)
+
+    def _sample_cpu(self) -> Optional[float]:
+        # runs on the worker; a usage needs two readings
+        previous, self._cpu_times = self._cpu_times, procfs.read_cpu_times()
+        if previous is None:
+            return None
+        return procfs.cpu_percent(previous, self._cpu_times)
+
+    def _sample_cpu_cores(self) -> Optional[list[float]]:
+        previous, self._core_times = self._core_times, procfs.read_all_cpu_times()
+        if previous is None or len(previous) != len(self._core_times):
+            return None
+        return [procfs.cpu_percent(before, after) for before, after in zip(previous, self._core_times)]
+
+    def _rates(self, metric: str, counters: dict[str, tuple[int, ...]]) -> Optional[dict]:
+        """Turn byte counters into per-second rates since the previous sample of `metric`."""
+        now = time.monotonic()
+        previous = self._counters.get(metric)
+        self._counters[metric] = (now, counters)
+        if previous is None:
+            return None
+        elapsed = now - previous[0]
+        rates = {}
+        for key, values in counters.items():
+            if before := previous[1].get(key):
+                rates[key] = tuple(max(0, value - old) / elapsed for value, old in zip(values, before))
+        return rates
+
+    def _reset_baseline(self, metric: str):
+        # the next reading after a pause must not average over the pause
+        match metric:
+            case "cpu":
+                self._cpu_times = None
+            case "cpu-cores":
+                self._core_times = None
+            case "processes":
+                self._processes.reset()
+            case _:
+                self._counters.pop(metric, None)
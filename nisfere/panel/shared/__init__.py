@@ -2,4 +2,6 @@ from shared.pop_over import PopOverWindow
 from shared.button_with_icon import ButtonWithIcon
 from shared.progress_bar_with_icon import ProgressBarWithIcon
 from shared.button import ButtonWidget as Button
-from shared.scrolling_label import ScrollingLabel
\ No newline at end of file
+from shared.scrolling_label import ScrollingLabel
+from shared.virtual_grid import VirtualGrid
+from shared.sparkline import Sparkline
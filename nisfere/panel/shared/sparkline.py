@@ -0,0 +1,82 @@
+import gi
+from typing import Optional
+
+from fabric.widgets.widget import Widget
+
+from utils.time_series import TimeSeries
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+
+class Sparkline(Gtk.DrawingArea, Widget):
+    """A small line graph of one tier of a time series.
+
+    The line takes the CSS `color` of the widget. The scale goes from 0 to
+    `max_value`, or to the largest value shown when `max_value` is None.
+    """
+
+    def __init__(
+        self,
+        series: Optional[TimeSeries] = None,
+        tier: int = 0,
+        max_value: Optional[float] = None,
+        line_width: float = 1.5,
+        name: str | None = None,
+        style_classes: str | list[str] | None = None,
+        size: tuple[int, int] = (120, 28),
+        **kwargs,
+    ):
+        Gtk.DrawingArea.__init__(self)  # type: ignore
+        Widget.__init__(self, name=name, style_classes=style_classes, size=size, **kwargs)
+
+        self._series = series
+        self._tier = tier
+        self._max_value = max_value
+        self._line_width = line_width
+
+        self.connect("draw", self.on_draw)
+
+    def set_series(self, series: Optional[TimeSeries]):
+        self._series = series
+        self.queue_draw()
+
+    def set_tier(self, tier: int):
+        self._tier = tier
+        self.queue_draw()
+
+    def on_draw(self, _, cr):
+        if not self._series:
+            return
+
+        values = self._series.values(self._tier)
+        if len(values) < 2:
+            return
+
+        width = self.get_allocated_width()
+        height = self.get_allocated_height()
+        top = self._max_value or max(values) or 1.0
+        # a full tier spans the whole width, a filling one grows from the right
+        step = width / max(1, self._series.capacity(self._tier) - 1)
+        x0 = width - step * (len(values) - 1)
+        points = [
+            (x0 + index * step, height - min(value, top) / top * (height - self._line_width))
+            for index, value in enumerate(values)
+        ]
+
+        color = self.get_style_context().get_color(self.get_state_flags())
+        cr.set_line_width(self._line_width)
+
+        cr.move_to(x0, height)
+        for x, y in points:
+            cr.line_to(x, y)
+        cr.line_to(points[-1][0], height)
+        cr.close_path()
+        cr.set_source_rgba(color.red, color.green, color.blue, 0.25 * color.alpha)
+        cr.fill()
+
+        cr.move_to(*points[0])
+        for x, y in points[1:]:
+            cr.line_to(x, y)
+        cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+        cr.stroke()
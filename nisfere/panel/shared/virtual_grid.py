@@ -0,0 +1,180 @@
+import gi
+from typing import Any, Callable, Optional
+
+from fabric.widgets.scrolledwindow import ScrolledWindow
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+
+class VirtualGrid(ScrolledWindow):
+    """A scrollable list/grid that only realizes the rows in view.
+
+    Items are plain data. Widgets are created with `create_item` only for
+    the rows intersecting the viewport (plus `overscan` rows on each side)
+    and are rebound with `bind_item` as the view scrolls, so the number of
+    widgets stays proportional to the viewport, not to the item count.
+    Use `columns=1` for a list. Every row is `row_height` tall, or as tall
+    as the first item once bound when `row_height` isn't given.
+    """
+
+    def __init__(
+        self,
+        create_item: Callable[[], Gtk.Widget],
+        bind_item: Callable[[Gtk.Widget, Any, int], None],
+        unbind_item: Optional[Callable[[Gtk.Widget], None]] = None,
+        columns: int = 1,
+        row_height: Optional[int] = None,
+        column_spacing: int = 0,
+        row_spacing: int = 0,
+        overscan: int = 2,
+        **kwargs,
+    ):
+        self._layout = Gtk.Layout(visible=True)
+
+        super().__init__(child=self._layout, **kwargs)
+
+        self._create_item = create_item
+        self._bind_item = bind_item
+        self._unbind_item = unbind_item
+        self._columns = max(1, columns)
+        self._row_height = row_height
+        self._column_spacing = column_spacing
+        self._row_spacing = row_spacing
+        self._overscan = overscan
+
+        self._items: list = []
+        self._bound: dict[int, Gtk.Widget] = {}  # item index -> widget
+        self._pool: list[Gtk.Widget] = []
+        self._width = 0
+
+        self.get_vadjustment().connect("value-changed", lambda *_: self.refresh())
+        self._layout.connect("size-allocate", self.on_size_allocate)
+
+    @property
+    def items(self) -> list:
+        return self._items
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    def set_items(self, items: list):
+        """Replace the items and rebind the rows in view."""
+        self._items = list(items)
+        for index in list(self._bound):
+            self._release(index)
+        self.get_vadjustment().set_value(0)
+        self._update_size()
+        self.refresh()
+
+    def get_widget(self, index: int) -> Optional[Gtk.Widget]:
+        """Return the widget bound to `index`, if that row is realized."""
+        return self._bound.get(index)
+
+    def get_row_range(self) -> tuple[int, int]:
+        """Return the first and last rows fully or partially in view."""
+        adjustment = self.get_vadjustment()
+        stride = self._stride()
+        first = int(adjustment.get_value() // stride)
+        last = int((adjustment.get_value() + adjustment.get_page_size()) // stride)
+        return first, last
+
+    def scroll_to_index(self, index: int):
+        """Scroll just enough to bring the row holding `index` into view."""
+        adjustment = self.get_vadjustment()
+        stride = self._stride()
+        top = (index // self._columns) * stride
+        bottom = top + (self._row_height or 0)
+
+        if top < adjustment.get_value():
+            adjustment.set_value(top)
+        elif bottom > adjustment.get_value() + adjustment.get_page_size():
+            adjustment.set_value(bottom - adjustment.get_page_size())
+        self.refresh()
+
+    def refresh(self):
+        if not self._items:
+            return
+
+        if self._row_height is None:
+            if not self._width:
+                return  # measured once allocated, heights depend on the width
+            self._measure_row_height()
+
+        first, last = self.get_row_range()
+        first = max(0, first - self._overscan)
+        last = last + self._overscan
+        start = first * self._columns
+        end = min(len(self._items), (last + 1) * self._columns)
+
+        for index in [i for i in self._bound if not start <= i < end]:
+            self._release(index)
+
+        for index in range(start, end):
+            if index not in self._bound:
+                self._acquire(index)
+
+    def on_size_allocate(self, _, allocation):
+        if allocation.width == self._width:
+            return
+        self._width = allocation.width
+        item_width = self._item_width()
+        for index, widget in self._bound.items():
+            widget.set_size_request(item_width, self._row_height)
+            self._layout.move(widget, *self._position(index))
+        self._update_size()
+        self.refresh()
+
+    def _acquire(self, index: int):
+        if self._pool:
+            widget = self._pool.pop()
+        else:
+            widget = self._create_item()
+            widget.set_no_show_all(True)
+            self._layout.put(widget, 0, 0)
+
+        widget.set_size_request(self._item_width(), self._row_height or -1)
+        self._layout.move(widget, *self._position(index))
+        self._bind_item(widget, self._items[index], index)
+        widget.set_visible(True)
+        self._bound[index] = widget
+
+    def _release(self, index: int):
+        widget = self._bound.pop(index)
+        widget.set_visible(False)
+        if self._unbind_item:
+            self._unbind_item(widget)
+        self._pool.append(widget)
+
+    def _measure_row_height(self):
+        # bound to a real item, an empty one lacks its icon and text
+        widget = self._create_item()
+        widget.set_no_show_all(True)
+        self._layout.put(widget, 0, 0)
+        self._bind_item(widget, self._items[0], 0)
+        height = widget.get_preferred_height_for_width(self._item_width())[1]
+        if self._unbind_item:
+            self._unbind_item(widget)
+        self._pool.append(widget)
+        self._row_height = max(1, height)
+        self._update_size()
+
+    def _stride(self) -> int:
+        return (self._row_height or 1) + self._row_spacing
+
+    def _item_width(self) -> int:
+        spacing = self._column_spacing * (self._columns - 1)
+        return max(1, (self._width - spacing) // self._columns)
+
+    def _position(self, index: int) -> tuple[int, int]:
+        row, column = divmod(index, self._columns)
+        return (
+            column * (self._item_width() + self._column_spacing),
+            row * self._stride(),
+        )
+
+    def _update_size(self):
+        rows = -(-len(self._items) // self._columns)
+        height = max(0, rows * self._stride() - self._row_spacing)
+        self._layout.set_size(max(1, self._width), height)
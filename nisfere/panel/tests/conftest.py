@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the panel imports its packages relative to its own folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
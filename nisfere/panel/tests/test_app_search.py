@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fabric")
+
+from utils.app_search import AppSearchIndex
+
+NAMES = [
+    ("Firefox", "Web Browser", "firefox"),
+    ("Chromium", "Web Browser", "chromium"),
+    ("Files", "File Manager", "nautilus"),
+    ("Terminal", "Terminal Emulator", "kitty"),
+    ("Text Editor", "Text Editor", "gnome-text-editor"),
+    ("Image Viewer", "Image Viewer", "eog"),
+    ("Videos", "Video Player", "totem"),
+    ("Music", "Music Player", "rhythmbox"),
+    ("Calculator", "Calculator", "gnome-calculator"),
+    ("Settings", "Settings", "gnome-control-center"),
+    ("Thunderbird", "Mail Client", "thunderbird"),
+    ("LibreOffice Writer", "Word Processor", "libreoffice"),
+    ("Visual Studio Code", "Text Editor", "code"),
+    ("GIMP", "Image Editor", "gimp"),
+    ("Inkscape", "Vector Graphics Editor", "inkscape"),
+    ("Steam", "Game Launcher", "steam"),
+    ("Discord", "Chat", "discord"),
+    ("Fire Alarm Monitor", "Monitor", "firealarm"),
+]
+
+QUERIES = ["iref", "firefox", "edit", "web br", "tex ed", "mus", "vwr", "fire al", "xyz"]
+
+
+def make_index():
+    apps = [
+        SimpleNamespace(display_name=name, name=name, generic_name=generic, executable=f"/usr/bin/{executable}")
+        for name, generic, executable in NAMES
+    ]
+    return AppSearchIndex(apps)
+
+
+def names(apps):
+    return [app.name for app in apps]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_typing_matches_fresh_queries(query):
+    typed = make_index()
+    for length in range(1, len(query) + 1):
+        prefix = query[:length]
+        assert names(typed.search(prefix)) == names(make_index().search(prefix)), prefix
+
+
+def test_mid_word_match_survives_typing():
+    index = make_index()
+    for length in range(1, 5):
+        results = index.search("iref"[:length])
+    assert "Firefox" in names(results)
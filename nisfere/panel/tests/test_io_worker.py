@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("loguru")
+GLib = pytest.importorskip("gi.repository.GLib")
+
+from utils.io_worker import IOWorker
+
+
+def test_callbacks_keep_their_own_result(monkeypatch):
+    idles = []
+    monkeypatch.setattr(GLib, "idle_add", lambda function, *args: idles.append((function, args)))
+
+    worker = IOWorker("test-io")
+    delivered = []
+    for value in range(3):
+        worker.submit(
+            lambda value=value: value * 10,
+            callback=lambda result, value=value: delivered.append((value, result)),
+        )
+    # every job finishes before the main loop gets to run any callback
+    worker.flush(timeout=5)
+
+    for function, args in idles:
+        function(*args)
+
+    assert delivered == [(0, 0), (1, 10), (2, 20)]
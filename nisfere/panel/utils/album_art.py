@@ -0,0 +1,115 @@
+import os
+import hashlib
+import urllib.request
+from typing import Callable, Optional
+from loguru import logger
+
+from utils.config import CONFIG
+from utils.io_worker import IOWorker
+from utils.pixbuf_cache import PixbufCache, pixbuf_cache
+
+from gi.repository import GdkPixbuf, Gio
+
+ALBUM_ART_FOLDER = f"{CONFIG['cache-folder']}/album-art"
+MAX_DISK_ENTRIES = 200
+DOWNLOAD_TIMEOUT = 10  # seconds
+
+
+def decode_at_size(data: bytes, size: int) -> GdkPixbuf.Pixbuf:
+    """Decode `data` straight to `size`x`size`, without a full-size intermediate."""
+    loader = GdkPixbuf.PixbufLoader.new()
+    loader.connect("size-prepared", lambda loader, *_: loader.set_size(size, size))
+    try:
+        loader.write(data)
+    finally:
+        loader.close()
+    return loader.get_pixbuf()
+
+
+def trim_folder(folder: str, keep: int):
+    entries = sorted(
+        (entry for entry in os.scandir(folder) if entry.is_file()),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in entries[:-keep]:
+        os.remove(entry.path)
+
+
+def fetch_art(url: str, cache_path: str, size: int) -> Optional[GdkPixbuf.Pixbuf]:
+    """Runs on the art worker: read `url` through the disk cache and decode it.
+
+    Never raises, so the loader always hears back and clears its waiting list.
+    """
+    try:
+        if not url.startswith(("http://", "https://")):
+            _, data, _ = Gio.File.new_for_uri(url).load_contents(None)
+        elif os.path.exists(cache_path):
+            with open(cache_path, "rb") as file:
+                data = file.read()
+            os.utime(cache_path)
+        else:
+            with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                data = response.read()
+            with open(f"{cache_path}.tmp", "wb") as file:
+                file.write(data)
+            os.replace(f"{cache_path}.tmp", cache_path)
+            trim_folder(os.path.dirname(cache_path), MAX_DISK_ENTRIES)
+
+        return decode_at_size(data, size)
+    except Exception as e:  # anything, see above
+        logger.warning(f"[Media] Error loading image from {url}: {e}")
+        return None
+
+
+class AlbumArtLoader:
+    """Loads album art without blocking the main loop.
+
+    Art is downloaded and decoded on its own worker thread, so a slow server
+    doesn't hold up other disk writes. Remote images are kept on disk under
+    a hash of their URL, and decoded images are kept in the shared pixbuf
+    cache. Concurrent requests for the same URL share one download.
+    """
+
+    def __init__(self, folder: str = ALBUM_ART_FOLDER, cache: PixbufCache = pixbuf_cache):
+        self._folder = folder
+        self._cache = cache
+        self._worker = IOWorker("nisfere-art")
+        self._waiting: dict[tuple[str, int], list[Callable]] = {}
+
+        os.makedirs(folder, exist_ok=True)
+
+    def load(self, url: str, size: int, callback: Callable[[GdkPixbuf.Pixbuf], None]):
+        """Call `callback` with the art of `url`, or the default image, at `size`."""
+        if not url:
+            return callback(self.get_default(size))
+
+        if (pixbuf := self._cache.lookup(url, size)) is not None:
+            return callback(pixbuf)
+
+        key = (url, size)
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return
+        self._waiting[key] = [callback]
+
+        cache_path = os.path.join(self._folder, hashlib.sha256(url.encode()).hexdigest()[:32])
+        self._worker.submit(
+            fetch_art, url, cache_path, size,
+            callback=lambda pixbuf: self._on_fetched(key, pixbuf),
+        )
+
+    def get_default(self, size: int) -> GdkPixbuf.Pixbuf:
+        path = CONFIG["default-media-image-path"]
+        return self._cache.get(path, size, lambda: GdkPixbuf.Pixbuf.new_from_file(path))
+
+    def _on_fetched(self, key: tuple[str, int], pixbuf: Optional[GdkPixbuf.Pixbuf]):
+        url, size = key
+        if pixbuf is not None:
+            self._cache.insert(url, size, pixbuf)
+        else:
+            pixbuf = self.get_default(size)
+        for callback in self._waiting.pop(key, []):
+            callback(pixbuf)
+
+
+album_art = AlbumArtLoader()
@@ -0,0 +1,194 @@
+import re
+import math
+import unicodedata
+from typing import Callable, Optional
+
+from fabric.utils import DesktopApp
+
+PREFIX_LENGTH = 6  # longest token prefix stored in the prefix index
+FUZZY_THRESHOLD = 12  # below this many direct hits, fuzzy matches are added
+
+TOKEN_SPLIT = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip accents so `Écrire` matches `ecr`."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_SPLIT.split(normalize(text)) if token]
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def fuzzy_score(needle: str, haystack: str) -> float:
+    """Score an in-order subsequence match, penalising the gaps between hits."""
+    position = -1
+    gaps = 0
+    for char in needle:
+        found = haystack.find(char, position + 1)
+        if found == -1:
+            return 0.0
+        if position != -1:
+            gaps += found - position - 1
+        position = found
+    return max(1.0, 20.0 - gaps)
+
+
+class AppSearchIndex:
+    """A precomputed search index over desktop applications.
+
+    Every app is tokenized once when the index is built. A prefix index
+    answers word-start lookups and a trigram index answers substring
+    lookups; fuzzy subsequence matching is only attempted when those give
+    few results. When a query extends the previous one the search narrows
+    the previous matches instead of starting over, with the same results.
+    """
+
+    def __init__(
+        self,
+        apps: list[DesktopApp],
+        frecency: Optional[Callable[[DesktopApp], float]] = None,
+    ):
+        self._apps = list(apps)
+        self._frecency = frecency
+        self._names: list[str] = []
+        self._haystacks: list[str] = []
+        self._tokens: list[list[str]] = []
+        self._prefixes: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+
+        self._last_query: Optional[list[str]] = None
+        self._last_matches: list[int] = []
+        self._last_fuzzy = False
+
+        for index, app in enumerate(self._apps):
+            name = normalize(app.display_name or app.name or "")
+            fields = " ".join(
+                field
+                for field in (
+                    app.display_name,
+                    app.name,
+                    app.generic_name,
+                    (app.executable or "").rsplit("/", 1)[-1],
+                )
+                if field
+            )
+            tokens = tokenize(fields)
+            haystack = " ".join(tokens)
+
+            self._names.append(name)
+            self._haystacks.append(haystack)
+            self._tokens.append(tokens)
+
+            for token in tokens:
+                for length in range(1, min(len(token), PREFIX_LENGTH) + 1):
+                    self._prefixes.setdefault(token[:length], set()).add(index)
+            for trigram in trigrams(haystack):
+                self._trigrams.setdefault(trigram, set()).add(index)
+
+    def __len__(self):
+        return len(self._apps)
+
+    @property
+    def apps(self) -> list[DesktopApp]:
+        return self._apps
+
+    def set_frecency(self, frecency: Optional[Callable[[DesktopApp], float]]):
+        self._frecency = frecency
+        self._last_query = None
+
+    def search(self, query: str) -> list[DesktopApp]:
+        """Return the apps matching `query`, best match first."""
+        tokens = tokenize(query)
+
+        if not tokens:
+            self._last_query = None
+            return sorted(
+                self._apps,
+                key=lambda app: (-self._boost(app), normalize(app.display_name or "")),
+            )
+
+        # narrowing the previous matches gives the same results as starting
+        # over, they are a superset of whatever the longer query matches
+        narrow = self._extends_last_query(tokens)
+        candidates = self._last_matches if narrow else self._candidates(tokens)
+        scored = self._score_all(candidates, tokens, fuzzy=False)
+
+        # few direct matches, add fuzzy ones
+        fuzzy = len(scored) < FUZZY_THRESHOLD
+        if fuzzy:
+            # previous fuzzy matches only cover this query if their token was
+            # already long enough to be fuzzy matched
+            if not (narrow and self._last_fuzzy and len(self._last_query[-1]) >= 3):
+                candidates = range(len(self._apps))
+            scored = self._score_all(candidates, tokens, fuzzy=True)
+
+        scored.sort(key=lambda item: (-item[0], self._names[item[1]]))
+
+        self._last_query = tokens
+        self._last_matches = [index for _, index in scored]
+        self._last_fuzzy = fuzzy
+
+        return [self._apps[index] for _, index in scored]
+
+    def _extends_last_query(self, tokens: list[str]) -> bool:
+        last = self._last_query
+        if not last or len(tokens) < len(last):
+            return False
+        return tokens[: len(last) - 1] == last[:-1] and tokens[len(last) - 1].startswith(last[-1])
+
+    def _candidates(self, tokens: list[str]) -> set[int] | range:
+        """Return every app the longest token matches directly, and maybe a few more."""
+        token = max(tokens, key=len)
+        if len(token) < 3:
+            # too short for the trigram index to find it mid-word
+            return range(len(self._apps))
+
+        candidates = set(self._prefixes.get(token[:PREFIX_LENGTH], ()))
+        grams = iter(trigrams(token))
+        substring_hits = set(self._trigrams.get(next(grams), ()))
+        for gram in grams:
+            substring_hits &= self._trigrams.get(gram, set())
+            if not substring_hits:
+                break
+        return candidates | substring_hits
+
+    def _score_all(self, candidates, tokens: list[str], fuzzy: bool) -> list[tuple[float, int]]:
+        return [
+            (score, index)
+            for index in candidates
+            if (score := self._score(index, tokens, fuzzy)) > 0
+        ]
+
+    def _score(self, index: int, tokens: list[str], fuzzy: bool) -> float:
+        name = self._names[index]
+        haystack = self._haystacks[index]
+        app_tokens = self._tokens[index]
+        total = 0.0
+
+        for token in tokens:
+            if name == token:
+                score = 100.0
+            elif name.startswith(token):
+                score = 80.0
+            elif any(app_token.startswith(token) for app_token in app_tokens):
+                score = 60.0
+            elif token in haystack:
+                score = 40.0
+            elif fuzzy and len(token) >= 3 and (score := fuzzy_score(token, haystack)):
+                pass
+            else:
+                return 0.0
+            total += score
+
+        return total + self._boost(self._apps[index])
+
+    def _boost(self, app: DesktopApp) -> float:
+        if not self._frecency:
+            return 0.0
+        return 10.0 * math.log1p(max(0.0, self._frecency(app)))
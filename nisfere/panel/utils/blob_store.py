@@ -0,0 +1,112 @@
+import os
+import hashlib
+from typing import Callable, Optional
+from loguru import logger
+
+from utils.io_worker import IOWorker, io_worker
+
+from gi.repository import GdkPixbuf, GLib
+
+
+def write_png(path: str, pixbuf: GdkPixbuf.Pixbuf) -> int:
+    if not os.path.exists(path):
+        pixbuf.savev(f"{path}.tmp", "png", [], [])
+        os.replace(f"{path}.tmp", path)
+    return os.path.getsize(path)
+
+
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def pixbuf_digest(pixbuf: GdkPixbuf.Pixbuf) -> str:
+    """Return an id for the pixel content of `pixbuf`."""
+    digest = hashlib.sha256()
+    digest.update(
+        f"{pixbuf.get_width()}x{pixbuf.get_height()}:{pixbuf.get_rowstride()}:{pixbuf.get_has_alpha()}".encode())
+    digest.update(pixbuf.read_pixel_bytes().get_data())
+    return digest.hexdigest()[:32]
+
+
+def remove_unreferenced(folder: str, referenced: set[str]):
+    for name in os.listdir(folder):
+        blob_id, _, _ = name.partition(".")
+        if blob_id not in referenced:
+            os.remove(os.path.join(folder, name))
+
+
+class BlobStore:
+    """A content-addressed directory of images.
+
+    Images are stored once per distinct pixel content, as `<hash>.png`,
+    so identical images (app avatars, logos) share a single file. Callers
+    keep the returned id and decode the image only when they need it.
+    The store doesn't count references: callers `delete` a blob once
+    nothing of theirs uses it.
+    """
+
+    def __init__(self, folder: str, worker: IOWorker = io_worker):
+        self._folder = folder
+        self._worker = worker
+        self._sizes: dict[str, int] = {}
+        self._pending: dict[str, GdkPixbuf.Pixbuf] = {}  # not written yet
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, blob_id: str) -> str:
+        return os.path.join(self._folder, f"{blob_id}.png")
+
+    def put_pixbuf(
+        self,
+        pixbuf: GdkPixbuf.Pixbuf,
+        callback: Optional[Callable[[str, int], None]] = None,
+    ) -> str:
+        """Store `pixbuf` and return its id. Encoding and writing run on the worker.
+
+        `callback` gets the id and size on disk once the blob is written.
+        Until then `load_pixbuf` returns `pixbuf` itself.
+        """
+        blob_id = pixbuf_digest(pixbuf)
+        self._pending[blob_id] = pixbuf
+        self._worker.submit(
+            write_png, self.path(blob_id), pixbuf,
+            callback=lambda size: self._on_stored(blob_id, size, callback),
+        )
+        return blob_id
+
+    def _on_stored(self, blob_id: str, size: int, callback: Optional[Callable[[str, int], None]]):
+        self._pending.pop(blob_id, None)
+        self._sizes[blob_id] = size
+        if callback:
+            callback(blob_id, size)
+
+    def size(self, blob_id: str) -> Optional[int]:
+        """Return the size of the blob on disk, None while it is still being written."""
+        if blob_id not in self._sizes:
+            try:
+                self._sizes[blob_id] = os.path.getsize(self.path(blob_id))
+            except OSError:
+                return None
+        return self._sizes[blob_id]
+
+    def delete(self, blob_id: str):
+        self._sizes.pop(blob_id, None)
+        self._pending.pop(blob_id, None)
+        self._worker.submit(remove_file, self.path(blob_id))
+
+    def load_pixbuf(self, blob_id: str) -> Optional[GdkPixbuf.Pixbuf]:
+        if (pixbuf := self._pending.get(blob_id)) is not None:
+            return pixbuf
+        try:
+            return GdkPixbuf.Pixbuf.new_from_file(self.path(blob_id))
+        except GLib.Error as e:
+            logger.warning(f"[BlobStore] Could not load {blob_id}: {e}")
+            return None
+
+    def collect(self, referenced: set[str]):
+        """Delete the blobs no longer referenced by anyone."""
+        self._sizes = {blob_id: size for blob_id, size in self._sizes.items() if blob_id in referenced}
+        self._pending = {blob_id: pixbuf for blob_id, pixbuf in self._pending.items() if blob_id in referenced}
+        self._worker.submit(remove_unreferenced, self._folder, set(referenced))
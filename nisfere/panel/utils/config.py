@@ -89,9 +89,25 @@ CONFIG = {
     "user-themes-folder": os.path.expanduser("~/.config/nisfere/themes"),
     "default-themes-folder": os.path.expanduser("~/.nisfere/themes"),
     "nisfere-scripts-path": os.path.expanduser("~/.nisfere/scripts"),
+    "cache-folder": os.path.expanduser("~/.cache/nisfere"),
     "notifications-cache-file-path": os.path.expanduser(
         "~/.cache/nisfere/notifications.json"
     ),
+    "notifications-images-folder": os.path.expanduser(
+        "~/.cache/nisfere/notification-images"
+    ),
+    "notifications-retention": {
+        "max-entries": fabric_config.get("notifications", {}).get("max_entries", 200),
+        "max-bytes": fabric_config.get("notifications", {}).get("max_bytes", 8 * 1024 * 1024),
+        "max-per-app": fabric_config.get("notifications", {}).get("max_per_app", 50),
+        "ttl": fabric_config.get("notifications", {}).get("ttl_days", 30) * 24 * 60 * 60,
+    },
+    "metrics-history": {
+        "resolution": fabric_config["side_panel"].get("history", {}).get("resolution_ms", 2000),
+        "capacity": fabric_config["side_panel"].get("history", {}).get("capacity", 120),
+        "factors": fabric_config["side_panel"].get("history", {}).get("tiers", [30]),
+        "always": fabric_config["side_panel"].get("history", {}).get("record_always", False),
+    },
     "default-media-image-path": get_relative_path("../assets/music.png"),
     "date-time-formatters": ["%I:%M %p %a", "%A", "%d/%m/%Y"],
     "calendar-clock-formatter": "%I:%M",
@@ -1,11 +1,8 @@
 import os
 import psutil
-import time
-import urllib.request
 import inspect
 
 from loguru import logger
-from gi.repository import GdkPixbuf
 from gi.repository import Gio, GLib
 from fabric.utils import truncate, get_relative_path
 
@@ -19,6 +16,7 @@ from utils.icons import (
     app_icons,
 )
 from utils.config import CONFIG
+from utils import procfs
 
 
 def create_inner_widgets(widget_names: list, widget_mapping: dict, bar=None, launcher=None):
@@ -107,33 +105,35 @@ def get_media_player_icon(player_name: str | None) -> str:
     return f"{media_player_player_icons.get(player_name, media_player_player_icons['default'])}"
 
 
-def load_image_from_url(url):
-    try:
-        if not url:
-            raise ValueError("Invalid URL")
-
-        with urllib.request.urlopen(url) as response:
-            loader = GdkPixbuf.PixbufLoader.new()
-            loader.write(response.read())
-            loader.close()
-            pixbuf = loader.get_pixbuf()
-            if pixbuf:
-                return pixbuf.scale_simple(120, 120, GdkPixbuf.InterpType.BILINEAR)
-
-    except Exception as e:
-        logger.warning(f"[Media] Error loading image from {url}: {e}")
-        path = CONFIG.get("default-media-image-path")
-        return GdkPixbuf.Pixbuf.new_from_file(path).scale_simple(
-            120, 120, GdkPixbuf.InterpType.BILINEAR
-        )
-
-
 def convert_ms(microseconds):
     seconds = (microseconds // 1000000) % 60
     minutes = (microseconds // (1000000 * 60)) % 60
     return f"{minutes}:{seconds:02d}"
 
 
+def format_rate(bytes_per_second: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if bytes_per_second < 1024:
+            return f"{bytes_per_second:.0f} {unit}/s" if unit == "B" else f"{bytes_per_second:.1f} {unit}/s"
+        bytes_per_second /= 1024
+    return f"{bytes_per_second:.1f} GB/s"
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_duration(milliseconds: int) -> str:
+    minutes = milliseconds // 60000
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h"
+
+
 def get_notifications_icon(count: int):
     if count > 0:
         return notification_icons["filled"]
@@ -141,7 +141,10 @@ def get_notifications_icon(count: int):
 
 
 def get_current_uptime():
-    uptime = time.time() - psutil.boot_time()
+    return format_uptime(procfs.read_uptime())
+
+
+def format_uptime(uptime: float):
     uptime_days, remainder = divmod(uptime, 86400)
     uptime_hours, remainder = divmod(remainder, 3600)
     return f"{int(uptime_days)} {'days' if uptime_days > 1 else 'day'}, {int(uptime_hours)} {'hours' if uptime_hours > 1 else 'hour'}"
@@ -153,18 +156,6 @@ def get_active_window_label(win_class, win_title):
     return f"{app_icons.get(win_class.lower(), default_icon)} {truncate(win_title, 20) if win_title and win_title != 'unknown' else default_win_name}"
 
 
-def get_cpu_usage():
-    return psutil.cpu_percent()
-
-
-def get_ram_usage():
-    return psutil.virtual_memory().percent
-
-
-def get_disk_usage():
-    return psutil.disk_usage("/").percent
-
-
 def get_battery_life():
     return psutil.sensors_battery()
 
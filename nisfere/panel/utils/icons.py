@@ -21,6 +21,8 @@ stop_recording = ""
 ram = "󰘚"
 cpu = ""
 disk = "󱛟"
+chevron_down = "󰅀"
+chevron_up = "󰅃"
 
 volume_icons = {
     "muted": "",
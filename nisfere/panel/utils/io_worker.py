@@ -0,0 +1,62 @@
+import queue
+import threading
+from typing import Any, Callable, Optional
+from loguru import logger
+
+from gi.repository import GLib
+
+
+class IOWorker:
+    """A single background thread that runs file I/O in submission order.
+
+    Jobs never run on the GTK main loop. An optional `callback` receives
+    the job's result back on the main loop through `GLib.idle_add`.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        job: Callable[..., Any],
+        *args,
+        callback: Optional[Callable[[Any], None]] = None,
+    ):
+        self._ensure_started()
+        self._jobs.put((job, args, callback))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every job submitted so far has run."""
+        done = threading.Event()
+        self.submit(done.set)
+        done.wait(timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job, args, callback = self._jobs.get()
+            try:
+                result = job(*args)
+            except Exception as e:
+                logger.error(f"[IOWorker] {self._name} job {job.__name__} failed: {e}")
+                continue
+            if callback:
+                # bound now, the next job may finish before the main loop runs this
+                GLib.idle_add(self._deliver, callback, result)
+
+    @staticmethod
+    def _deliver(callback: Callable[[Any], None], result: Any) -> bool:
+        callback(result)
+        return False
+
+
+io_worker = IOWorker("nisfere-io")
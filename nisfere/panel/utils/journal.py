@@ -0,0 +1,149 @@
+import os
+import json
+from loguru import logger
+
+from utils.io_worker import IOWorker, io_worker
+
+from gi.repository import GLib
+
+
+def append_lines(path: str, lines: list[str]):
+    with open(path, "a") as file:
+        file.writelines(lines)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def write_snapshot(path: str, journal_path: str, records: list[dict]):
+    """Atomically replace the snapshot, then drop the journal it absorbed."""
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(records, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{path}.tmp", path)
+    # a crash before this point only replays operations already in the snapshot
+    open(journal_path, "w").close()
+
+
+class JournalStore:
+    """A JSON snapshot plus an append-only journal of changes to it.
+
+    Adds and removals are appended to the journal as one JSON line each
+    instead of rewriting the snapshot. After `compact_after` journal entries
+    the records are written to a new snapshot, which atomically replaces the
+    old one before the journal is truncated. Replaying a journal is
+    idempotent, so a crash at any point leaves a loadable store. Entries
+    made within `batch_delay` milliseconds of each other are written in one
+    append. All disk access runs on the I/O worker thread, except `load`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        compact_after: int = 100,
+        batch_delay: int = 250,
+        worker: IOWorker = io_worker,
+    ):
+        self._path = path
+        self._journal_path = f"{path}.journal"
+        self._key = key
+        self._compact_after = compact_after
+        self._batch_delay = batch_delay
+        self._worker = worker
+        self._records: dict = {}
+        self._journal_entries = 0
+        self._pending: list[str] = []
+        self._flush_id = None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    @property
+    def records(self) -> dict:
+        return self._records
+
+    def load(self) -> dict:
+        """Read the snapshot and replay the journal on top of it."""
+        self._records = {}
+        try:
+            with open(self._path, "r") as file:
+                self._records = {record[self._key]: record for record in json.load(file)}
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"[Journal] Corrupt snapshot {self._path}: {e}")
+
+        try:
+            with open(self._journal_path, "r") as file:
+                for line in file:
+                    try:
+                        self._replay(json.loads(line))
+                    except json.JSONDecodeError:
+                        # a torn write can only be the last line
+                        logger.warning(f"[Journal] Skipping torn entry in {self._journal_path}")
+                        break
+                    self._journal_entries += 1
+        except FileNotFoundError:
+            pass
+
+        return self._records
+
+    def _replay(self, entry: dict):
+        match entry.get("op"):
+            case "add":
+                record = entry["record"]
+                self._records[record[self._key]] = record
+            case "remove":
+                self._records.pop(entry["id"], None)
+            case "clear":
+                self._records.clear()
+
+    def add(self, record: dict):
+        self._records[record[self._key]] = record
+        self._append({"op": "add", "record": record})
+
+    def remove(self, record_id):
+        if self._records.pop(record_id, None) is not None:
+            self._append({"op": "remove", "id": record_id})
+
+    def clear(self):
+        self._records.clear()
+        self.compact()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot."""
+        self._journal_entries = 0
+        # the snapshot already holds whatever was waiting to be appended
+        self._pending = []
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        self._worker.submit(
+            write_snapshot, self._path, self._journal_path, list(self._records.values()))
+
+    def _append(self, entry: dict):
+        self._journal_entries += 1
+        if self._journal_entries >= self._compact_after:
+            return self.compact()
+        self._pending.append(json.dumps(entry) + "\n")
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(self._batch_delay, self._on_flush_timeout)
+
+    def flush(self):
+        """Append the entries waiting for the current batch."""
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        if self._pending:
+            lines, self._pending = self._pending, []
+            self._worker.submit(append_lines, self._journal_path, lines)
+
+    def close(self, timeout: float = 2.0):
+        """Write out the current batch and wait for pending writes, e.g. on quit."""
+        self.flush()
+        self._worker.flush(timeout)
+
+    def _on_flush_timeout(self) -> bool:
+        self._flush_id = None
+        self.flush()
+        return False
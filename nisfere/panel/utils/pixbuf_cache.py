@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from gi.repository import GdkPixbuf
+
+DEFAULT_BUDGET = 8 * 1024 * 1024  # bytes of pixel data
+
+
+def pixbuf_size(pixbuf: GdkPixbuf.Pixbuf) -> int:
+    return pixbuf.get_rowstride() * pixbuf.get_height()
+
+
+class PixbufCache:
+    """An LRU cache of scaled pixbufs, bounded by the memory they use.
+
+    Entries are keyed by `(source, size)`, where `source` identifies the
+    image content (a blob id, a file path). On a miss the image is loaded
+    with the given callable and scaled once; later lookups of the same
+    source and size, from any widget, share the scaled pixbuf. The least
+    recently used entries are dropped once `budget` bytes are exceeded.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self._budget = budget
+        self._entries: OrderedDict[tuple, GdkPixbuf.Pixbuf] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(
+        self,
+        source: Hashable,
+        size: int,
+        load: Callable[[], Optional[GdkPixbuf.Pixbuf]],
+    ) -> Optional[GdkPixbuf.Pixbuf]:
+        """Return the image of `source` scaled to `size`x`size`."""
+        if (pixbuf := self.lookup(source, size)) is not None:
+            return pixbuf
+
+        if (original := load()) is None:
+            return None
+        pixbuf = original.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
+        self.insert(source, size, pixbuf)
+        return pixbuf
+
+    def lookup(self, source: Hashable, size: int) -> Optional[GdkPixbuf.Pixbuf]:
+        """Return the cached image without loading it on a miss."""
+        key = (source, size)
+        if (pixbuf := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pixbuf
+        self.misses += 1
+        return None
+
+    def insert(self, source: Hashable, size: int, pixbuf: GdkPixbuf.Pixbuf):
+        """Cache an image that was already scaled to `size`, e.g. loaded asynchronously."""
+        key = (source, size)
+        if (previous := self._entries.pop(key, None)) is not None:
+            self._bytes -= pixbuf_size(previous)
+        self._entries[key] = pixbuf
+        self._bytes += pixbuf_size(pixbuf)
+        while self._bytes > self._budget and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= pixbuf_size(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+pixbuf_cache = PixbufCache()
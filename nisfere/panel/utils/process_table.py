@@ -0,0 +1,125 @@
+import os
+import time
+from typing import NamedTuple, Optional
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class ProcessSample(NamedTuple):
+    pid: int
+    name: str
+    command: str
+    cpu: float  # percent of one core, like top
+    rss: int  # bytes
+    io: float  # bytes read and written per second, 0 when not readable
+
+
+def read_stat(pid: int) -> Optional[tuple[str, int, int, int]]:
+    """Return the name, CPU ticks, start time and resident pages of `pid`."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as file:
+            data = file.read().decode(errors="replace")
+    except OSError:
+        return None  # exited since listing
+    # the name may contain spaces and parentheses, it ends at the last ')'
+    name = data[data.index("(") + 1:data.rindex(")")]
+    fields = data[data.rindex(")") + 2:].split()
+    # fields[0] is field 3 (state) of proc(5)
+    return name, int(fields[11]) + int(fields[12]), int(fields[19]), int(fields[21])
+
+
+def read_command(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as file:
+            return file.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def read_io_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/io", "r") as file:
+            counters = dict(line.split(": ") for line in file)
+        return int(counters["read_bytes"]) + int(counters["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None  # other users' processes aren't readable
+
+
+class ProcessTable:
+    """Per-process usage, computed from the change since the previous sample.
+
+    Names and command lines are read once per process, when its pid first
+    shows up (a reused pid is told apart by its start time). I/O counters
+    are only read for the processes that make the top lists.
+    """
+
+    def __init__(self, top: int = 8):
+        self.top = top
+        self._names: dict[int, tuple[int, str, str]] = {}  # pid -> start time, name, command
+        self._ticks: dict[int, int] = {}
+        self._io: dict[int, int] = {}
+        self._time: Optional[float] = None
+
+    def reset(self):
+        """Forget the previous sample, e.g. after not sampling for a while."""
+        self._ticks = {}
+        self._io = {}
+        self._time = None
+
+    def sample(self) -> Optional[dict[str, list[ProcessSample]]]:
+        """Return the top processes by `cpu` and by `memory`; None on the first call."""
+        now = time.monotonic()
+        elapsed = now - self._time if self._time else 0.0
+        self._time = now
+
+        ticks: dict[int, int] = {}
+        usages: list[tuple[int, float, int]] = []
+        for entry in os.scandir("/proc"):
+            if not entry.name.isdigit():
+                continue
+            pid = int(entry.name)
+            if (stat := read_stat(pid)) is None:
+                continue
+            name, cpu_ticks, start_time, pages = stat
+
+            known = self._names.get(pid)
+            if known is None or known[0] != start_time:
+                self._names[pid] = (start_time, name, read_command(pid) or name)
+                previous = None
+            else:
+                previous = self._ticks.get(pid)
+
+            ticks[pid] = cpu_ticks
+            cpu = 0.0
+            if previous is not None and elapsed:
+                cpu = 100.0 * (cpu_ticks - previous) / CLOCK_TICKS / elapsed
+            usages.append((pid, cpu, pages * PAGE_SIZE))
+
+        for pid in self._names.keys() - ticks.keys():
+            del self._names[pid]
+        self._ticks = ticks
+
+        if not elapsed:
+            return None
+
+        by_cpu = sorted(usages, key=lambda usage: usage[1], reverse=True)[:self.top]
+        by_memory = sorted(usages, key=lambda usage: usage[2], reverse=True)[:self.top]
+
+        io = {}
+        for pid, _, _ in {*by_cpu, *by_memory}:
+            if (io_bytes := read_io_bytes(pid)) is None:
+                continue
+            previous = self._io.get(pid)
+            io[pid] = max(0, io_bytes - previous) / elapsed if previous is not None else 0.0
+            self._io[pid] = io_bytes
+        for pid in self._io.keys() - ticks.keys():
+            del self._io[pid]
+
+        def to_samples(usages):
+            return [
+                ProcessSample(pid, self._names[pid][1], self._names[pid][2], round(cpu, 1), rss, io.get(pid, 0.0))
+                for pid, cpu, rss in usages
+            ]
+
+        return {"cpu": to_samples(by_cpu), "memory": to_samples(by_memory)}
@@ -0,0 +1,94 @@
+import os
+
+
+def read_cpu_times() -> tuple[int, int]:
+    """Return the total and idle jiffies of all CPUs, from `/proc/stat`."""
+    with open("/proc/stat", "r") as file:
+        fields = file.readline().split()
+    # user nice system idle iowait irq softirq steal; guest time is already in user
+    values = [int(value) for value in fields[1:9]]
+    return sum(values), values[3] + values[4]
+
+
+def read_all_cpu_times() -> list[tuple[int, int]]:
+    """Return the total and idle jiffies of all CPUs together, then of each core."""
+    times = []
+    with open("/proc/stat", "r") as file:
+        for line in file:
+            if not line.startswith("cpu"):
+                break
+            values = [int(value) for value in line.split()[1:9]]
+            times.append((sum(values), values[3] + values[4]))
+    return times
+
+
+def cpu_percent(previous: tuple[int, int], current: tuple[int, int]) -> float:
+    total = current[0] - previous[0]
+    idle = current[1] - previous[1]
+    if total <= 0:
+        return 0.0
+    return round(100.0 * (total - idle) / total, 1)
+
+
+def read_meminfo() -> dict[str, int]:
+    """Return `/proc/meminfo` in kB."""
+    meminfo = {}
+    with open("/proc/meminfo", "r") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            meminfo[key] = int(value.split()[0])
+    return meminfo
+
+
+def memory_percent() -> float:
+    meminfo = read_meminfo()
+    total = meminfo["MemTotal"]
+    available = meminfo.get("MemAvailable", meminfo["MemFree"])
+    return round(100.0 * (total - available) / total, 1)
+
+
+def disk_percent(path: str = "/") -> float:
+    """Return the used space of the filesystem at `path`, as `df` reports it."""
+    stat = os.statvfs(path)
+    used = (stat.f_blocks - stat.f_bfree) * stat.f_frsize
+    available = stat.f_bavail * stat.f_frsize
+    if used + available == 0:
+        return 0.0
+    return round(100.0 * used / (used + available), 1)
+
+
+def read_uptime() -> float:
+    """Return the seconds since boot."""
+    with open("/proc/uptime", "r") as file:
+        return float(file.read().split()[0])
+
+
+def is_physical_disk(name: str) -> bool:
+    # partitions, loop devices and device-mapper volumes would be counted twice
+    return os.path.exists(f"/sys/block/{name}/device")
+
+
+def read_disk_bytes() -> tuple[int, int]:
+    """Return the bytes read from and written to all physical disks, from `/proc/diskstats`."""
+    read = written = 0
+    with open("/proc/diskstats", "r") as file:
+        for line in file:
+            fields = line.split()
+            if is_physical_disk(fields[2]):
+                read += int(fields[5]) * 512  # sectors are always 512 bytes here
+                written += int(fields[9]) * 512
+    return read, written
+
+
+def read_net_dev() -> dict[str, tuple[int, int]]:
+    """Return the received and sent bytes of each interface but loopback, from `/proc/net/dev`."""
+    counters = {}
+    with open("/proc/net/dev", "r") as file:
+        for line in file.readlines()[2:]:
+            interface, _, data = line.partition(":")
+            interface = interface.strip()
+            if interface == "lo":
+                continue
+            fields = data.split()
+            counters[interface] = (int(fields[0]), int(fields[8]))
+    return counters
@@ -0,0 +1,85 @@
+from array import array
+
+
+class RingBuffer:
+    """A fixed-size buffer of floats that overwrites its oldest value."""
+
+    def __init__(self, capacity: int):
+        self._data = array("f", bytes(4 * capacity))
+        self._capacity = capacity
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def push(self, value: float):
+        end = (self._start + self._length) % self._capacity
+        self._data[end] = value
+        if self._length < self._capacity:
+            self._length += 1
+        else:
+            self._start = (self._start + 1) % self._capacity
+
+    def latest(self) -> float:
+        if not self._length:
+            return 0.0
+        return self._data[(self._start + self._length - 1) % self._capacity]
+
+    def values(self) -> list[float]:
+        """Return the values, oldest first."""
+        end = self._start + self._length
+        if end <= self._capacity:
+            return self._data[self._start:end].tolist()
+        return (self._data[self._start:] + self._data[:end - self._capacity]).tolist()
+
+
+class TimeSeries:
+    """Samples at a fixed resolution plus coarser, downsampled tiers.
+
+    Tier 0 keeps the last `capacity` samples. Each further tier keeps the
+    mean of every `factor` values of the tier before it, so it covers
+    `factor` times as long with the same memory.
+    """
+
+    def __init__(self, resolution: int, capacity: int, factors: list[int] = ()):
+        self.resolution = resolution  # ms between samples
+        self._tiers = [RingBuffer(capacity) for _ in range(len(factors) + 1)]
+        self._factors = list(factors)
+        self._pending = [[0.0, 0] for _ in factors]  # running sum, count
+
+    @property
+    def tiers(self) -> int:
+        return len(self._tiers)
+
+    def capacity(self, tier: int = 0) -> int:
+        return self._tiers[tier].capacity
+
+    def tier_span(self, tier: int) -> int:
+        """Return how many ms a full `tier` covers."""
+        span = self.resolution * self._tiers[tier].capacity
+        for factor in self._factors[:tier]:
+            span *= factor
+        return span
+
+    def push(self, value: float):
+        self._tiers[0].push(value)
+        for tier, factor in enumerate(self._factors):
+            pending = self._pending[tier]
+            pending[0] += value
+            pending[1] += 1
+            if pending[1] < factor:
+                return
+            value = pending[0] / factor
+            pending[0], pending[1] = 0.0, 0
+            self._tiers[tier + 1].push(value)
+
+    def latest(self) -> float:
+        return self._tiers[0].latest()
+
+    def values(self, tier: int = 0) -> list[float]:
+        return self._tiers[tier].values()
@@ -1,21 +1,21 @@
 import gi
 
-from collections.abc import Iterator
-
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.image import Image
 from fabric.widgets.entry import Entry
-from fabric.widgets.scrolledwindow import ScrolledWindow
 
-from fabric.utils import DesktopApp, get_desktop_applications, idle_add
 from fabric.core import Signal
 
-from shared import Button, PopOverWindow
+from services import desktop_apps_service, launch_history_service, CachedDesktopApp
+from shared import Button, PopOverWindow, VirtualGrid
+from utils.app_search import AppSearchIndex
 from utils.icons import apps as apps_icon, close as close_icon
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, Gdk
+from gi.repository import Gtk, Gdk, GdkPixbuf
+
+APP_ICON_SIZE = 24
 
 
 class AppLauncher(Box):
@@ -31,19 +31,28 @@ class AppLauncher(Box):
             **kwargs,
         )
 
-        self._arranger_handler: int = 0
-        self._all_apps = []
-        self.closed = False
-        self.viewport = Gtk.Grid(column_spacing=10, row_spacing=10)
-
-        self.viewport.connect("key-press-event", self.on_key_press)
+        self._search_index: AppSearchIndex | None = None
+        self._icons: dict[str, GdkPixbuf.Pixbuf] = {}
 
-        self.scrolled_window = ScrolledWindow(
+        desktop_apps_service.connect("changed", lambda *args: self.on_apps_changed())
+        self.closed = False
+        # only the rows in view get an AppSlot, slots are rebound on scroll
+        self.viewport = VirtualGrid(
             name="app-launcher-scroll-bar",
             style_classes="scrollbar",
             size=(620, 350),
-            child=self.viewport,
+            columns=2,
+            column_spacing=10,
+            row_spacing=10,
+            create_item=lambda: AppSlot(on_launch=lambda *_: self.emit("closed")),
+            bind_item=lambda slot, app, index: slot.bind(app, index, self.get_icon(app)),
+            unbind_item=lambda slot: slot.unbind(),
         )
+        self.viewport.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+
+        self.viewport.connect("key-press-event", self.on_key_press)
+
+        self.scrolled_window = self.viewport
 
         self.icon_header = Label(
             name="app-launcher-icon", label=apps_icon, v_expand=True, h_align="center"
@@ -54,6 +63,8 @@ class AppLauncher(Box):
             placeholder="Search Applications...",
             h_expand=True,
             notify_text=lambda entry, *args: self.arrange_viewport(entry.get_text()),
+            on_activate=lambda *args: self.launch_first_result(),
+            on_key_press_event=self.on_entry_key_press,
         )
 
         self.close_button = Button(
@@ -75,109 +86,133 @@ class AppLauncher(Box):
         ]
 
     def on_key_press(self, widget, event):
-        toplevel = widget.get_toplevel()
-
-        buttons = [
-            child for child in widget.get_children() if isinstance(child, Button)
-        ]
-        if not buttons:
+        count = len(self.viewport.items)
+        if not count:
             return False  # No buttons to navigate
 
-        # Get currently focused widget
-        focused_widget = toplevel.get_focus()
+        # slots know the result index they're bound to, no list scan needed
+        focused_widget = widget.get_toplevel().get_focus()
+        index = getattr(focused_widget, "index", None)
 
-        if focused_widget not in self.viewport.get_children():
-            buttons[0].grab_focus()  # Default focus to first button
+        if index is None:
+            self.focus_index(0)  # Default focus to first button
             return True
 
-        index = buttons.index(focused_widget)
-        cols = 2
+        cols = self.viewport.columns
+        first_row, last_row = self.viewport.get_row_range()
+        page = max(1, last_row - first_row) * cols
+
+        match event.keyval:
+            case Gdk.KEY_Down:
+                new_index = index + cols if index + cols < count else index % cols
+            case Gdk.KEY_Up:
+                if index - cols >= 0:
+                    new_index = index - cols
+                else:
+                    # wrap to the same column on the last row
+                    last_row_start = ((count - 1) // cols) * cols
+                    new_index = min(last_row_start + index, count - 1)
+            case Gdk.KEY_Right:
+                new_index = (index + 1) % count
+            case Gdk.KEY_Left:
+                new_index = (index - 1) % count
+            case Gdk.KEY_Home:
+                new_index = 0
+            case Gdk.KEY_End:
+                new_index = count - 1
+            case Gdk.KEY_Page_Down:
+                new_index = min(index + page, count - 1)
+            case Gdk.KEY_Page_Up:
+                new_index = max(index - page, 0)
+            case _:
+                return False  # Ignore other keys
+
+        self.focus_index(new_index)  # Move focus to new button
+        return True
 
-        # Wrapping logic for Down and Up keys
-        if event.keyval == Gdk.KEY_Down:
-            new_index = (
-                index - cols if index - cols >= 0 else index + (len(buttons) - cols)
-            )
-        elif event.keyval == Gdk.KEY_Up:
-            new_index = (
-                index + cols
-                if index + cols < len(buttons)
-                else index - (len(buttons) - cols)
-            )
+    def on_entry_key_press(self, _, event):
+        if event.keyval in (Gdk.KEY_Down, Gdk.KEY_Page_Down) and self.viewport.items:
+            self.focus_index(0)
+            return True
+        return False
 
-        else:
-            return False  # Ignore other keys
+    def focus_index(self, index: int):
+        index = max(0, min(index, len(self.viewport.items) - 1))
+        self.viewport.scroll_to_index(index)
+        if widget := self.viewport.get_widget(index):
+            widget.grab_focus()
 
-        buttons[new_index].grab_focus()  # Move focus to new button
-        return True
+    def launch_first_result(self):
+        if widget := self.viewport.get_widget(0):
+            widget.launch()
 
     def arrange_viewport(self, query: str = ""):
-        for child in self.viewport.get_children():
-            child.destroy()
-            self.viewport.remove(child)
-
-        col = 1
-        row = 0
-
-        filtered_apps_iter = iter(
-            [
-                {"col": col, "row": row, "app": app}
-                for app in self._all_apps
-                if query.casefold()
-                in (
-                    (app.display_name or "")
-                    + (" " + app.name + " ")
-                    + (app.generic_name or "")
-                ).casefold()
-                if (col := col + 1) % 2 != 0 or (col := 0) is col and (row := row + 1)
-            ]
-        )
-
-        self._arranger_handler = idle_add(
-            self.add_next_application, filtered_apps_iter, pin=True
-        )
+        if self._search_index is None:
+            self._search_index = AppSearchIndex(
+                desktop_apps_service.applications,
+                frecency=lambda app: launch_history_service.score(app.id),
+            )
 
+        self.viewport.set_items(self._search_index.search(query))
         return False
 
-    def add_next_application(self, apps_iter: Iterator[dict]):
-        if not (app_dict := next(apps_iter, None)):
-            return False
+    def get_icon(self, app: CachedDesktopApp) -> GdkPixbuf.Pixbuf:
+        key = app.icon_name or app.name
+        if (pixbuf := self._icons.get(key)) is None:
+            pixbuf = self._icons[key] = app.get_icon_pixbuf(size=APP_ICON_SIZE)
+        return pixbuf
+
+    def close(self, *_):
+        self.viewport.set_items([])
+
+    def open(self):
+        self.arrange_viewport("")
 
-        app: DesktopApp = app_dict.get("app")
-        col: int = app_dict.get("col")
-        row: int = app_dict.get("row")
+    def on_apps_changed(self):
+        self._search_index = None
+        self._icons.clear()
+        if self.get_mapped():
+            # open: rerun the current query against the new list
+            self.arrange_viewport(self.search_entry.get_text())
 
-        app_button = self.bake_application_slot(app)
 
-        self.viewport.attach(app_button, col, row, 1, 1)
+class AppSlot(Button):
+    """A launcher button that is rebound to different apps instead of rebuilt."""
 
-        return True
+    def __init__(self, on_launch, **kwargs):
+        self.icon = Image(h_align="start")
+        self.label = Label(v_align="center", h_align="center")
 
-    def bake_application_slot(self, app: DesktopApp, **kwargs) -> Button:
-        return Button(
+        super().__init__(
             name="app-launcher-button",
             child=Box(
                 orientation="h",
                 spacing=12,
-                children=[
-                    Image(pixbuf=app.get_icon_pixbuf(size=24), h_align="start"),
-                    Label(
-                        label=app.display_name or "Unknown",
-                        v_align="center",
-                        h_align="center",
-                    ),
-                ],
+                children=[self.icon, self.label],
             ),
-            tooltip_text=app.description,
-            on_clicked=lambda *_: (app.launch(), self.emit("closed")),
+            on_clicked=lambda *_: self.launch(),
             h_expand=True,
             **kwargs,
         )
 
-    def close(self, *_):
-        self._all_apps = []
-        self.viewport.children = []
-
-    def open(self):
-        self._all_apps = get_desktop_applications()
-        self.arrange_viewport("")
+        self.app: CachedDesktopApp | None = None
+        self.index: int | None = None
+        self._on_launch = on_launch
+
+    def bind(self, app: CachedDesktopApp, index: int, pixbuf: GdkPixbuf.Pixbuf | None):
+        self.index = index
+        if app is not self.app:
+            self.app = app
+            self.icon.set_from_pixbuf(pixbuf)
+            self.label.set_label(app.display_name or "Unknown")
+            self.set_tooltip_text(app.description)
+
+    def unbind(self):
+        self.app = None
+        self.index = None
+
+    def launch(self):
+        if self.app:
+            self.app.launch()
+            launch_history_service.record(self.app.id)
+            self._on_launch()
@@ -4,7 +4,7 @@ import time
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 
-from fabricators.date_fabricator import date_fabricator
+from services import system_metrics_service
 from utils.config import CONFIG
 
 gi.require_version("Gtk", "3.0")
@@ -34,7 +34,10 @@ class Calendar(Box):
 
         self.children = [self.clock_label, self.calendar]
 
-    def update_clock_label(self, updated_time: time):
+        # ticks only while the calendar popover is open
+        system_metrics_service.watch("time", self, self.update_clock_label)
+
+    def update_clock_label(self, updated_time: time.struct_time):
         self.clock_label.set_label(
-            updated_time.strftime(CONFIG["calendar-clock-formatter"])
+            time.strftime(CONFIG["calendar-clock-formatter"], updated_time)
         )
@@ -1,3 +1,4 @@
+from typing import Optional
 from loguru import logger
 
 from fabric.widgets.box import Box
@@ -6,29 +7,40 @@ from fabric.widgets.image import Image
 from fabric.widgets.scale import Scale
 
 from fabric.utils.helpers import (
-    invoke_repeater,
     bulk_connect,
     bulk_disconnect,
     get_relative_path,
 )
 
-from services import MediaPlayerService, MediaManager
+from services import MediaPlayerService, media_manager_service
 
 from shared import Button, ScrollingLabel, PopOverWindow
 
 from utils.config import CONFIG
 from utils.icons import media_player_icons
-from utils.helpers import load_image_from_url, convert_ms
+from utils.helpers import convert_ms, get_media_player_icon
+from utils.album_art import album_art
+
+from gi.repository import GLib
+
+ALBUM_IMAGE_SIZE = 120
+TICK_INTERVAL = 1000  # ms
 
 
 class MediaPlayerMenu(PopOverWindow):
-    def __init__(self, media_player: MediaPlayerService, **kwargs):
+    """The controls of one media player; `bind` switches to another one.
+
+    When several players are running, a row of buttons above the controls
+    makes any of them the current player.
+    """
+
+    def __init__(self, media_player: Optional[MediaPlayerService] = None, **kwargs):
         super().__init__(name="media-player-menu", **kwargs)
 
         self.user_interacting = False
         self.timeout_id = None
 
-        self.media_player = media_player
+        self.media_player = None
 
         self.track_title_label = ScrollingLabel(
             name="track-title", h_align="start")
@@ -99,19 +111,19 @@ class MediaPlayerMenu(PopOverWindow):
 
         self.song_image = Image(name="media-image")
 
-        bulk_connect(
-            self.media_player,
-            {
-                "notify::track": self.on_track_changed,
-                "notify::track-duration": self.on_track_duration_changed,
-                "notify::track-position": self.on_track_position_changed,
-                "notify::album-image-url": self.on_album_image_url_changed,
-                "notify::status": self.on_playback_status_changed,
-                "exit": self.on_exit,
-            },
+        self.switcher_box = Box(
+            name="media-player-switcher",
+            orientation="h",
+            spacing=4,
+            h_align="start",
         )
 
-        invoke_repeater(1000, self.update_scale)
+        media_manager_service.connect("player-appeared", self.update_switcher)
+        media_manager_service.connect("player-vanished", self.update_switcher)
+
+        # positions are extrapolated by the service, the scale only
+        # needs to tick while it can be seen
+        self.connect("notify::visible", self.on_visibility_changed)
 
         self.add(
             Box(
@@ -119,19 +131,71 @@ class MediaPlayerMenu(PopOverWindow):
                 children=[
                     Box(
                         style_classes="menu-inner",
-                        orientation="h",
-                        name=self.get_name(),
-                        spacing=13,
-                        children=[self.song_image, self.song_mgmt_box],
+                        orientation="v",
+                        spacing=8,
+                        children=[
+                            self.switcher_box,
+                            Box(
+                                orientation="h",
+                                name=self.get_name(),
+                                spacing=13,
+                                children=[self.song_image, self.song_mgmt_box],
+                            ),
+                        ],
                     )
                 ],
             )
         )
 
+        self.bind(media_player)
+
+    def bind(self, media_player: Optional[MediaPlayerService]):
+        """Show `media_player` in the menu, releasing the previous one."""
+        if media_player is self.media_player:
+            return
+        self.unbind()
+
+        if not media_player:
+            self.set_visible(False)
+            return
+
+        self.media_player = media_player
+        bulk_connect(
+            self.media_player,
+            {
+                "notify::track": self.on_track_changed,
+                "notify::track-duration": self.on_track_duration_changed,
+                "notify::track-position": self.on_track_position_changed,
+                "notify::album-image-url": self.on_album_image_url_changed,
+                "notify::status": self.on_playback_status_changed,
+                "exit": self.on_player_exit,
+            },
+        )
         self.update_ui()
+        self.update_switcher()
+
+    def update_switcher(self, *args):
+        """Rebuild the player buttons, marking the bound player."""
+        for child in self.switcher_box.get_children():
+            child.destroy()
+
+        players = media_manager_service.players
+        self.switcher_box.set_visible(len(players) > 1)
+        if len(players) < 2:
+            return
+
+        for player in players:
+            button = Button(
+                label=get_media_player_icon(player.player_name),
+                tooltip_text=f"{player.player_instance}: {player.track}",
+                on_clicked=lambda *_, player=player: media_manager_service.set_current_player(player),
+            )
+            if player is self.media_player:
+                button.get_style_context().add_class("active")
+            self.switcher_box.add(button)
+        self.switcher_box.show_all()
 
-    def on_exit(self, *args):
-        """Properly clean up the menu on exit."""
+    def unbind(self):
         if self.media_player:
             bulk_disconnect(
                 self.media_player,
@@ -141,12 +205,27 @@ class MediaPlayerMenu(PopOverWindow):
                     self.on_track_position_changed,
                     self.on_album_image_url_changed,
                     self.on_playback_status_changed,
-                    self.on_exit,
+                    self.on_player_exit,
                 ],
             )
             self.media_player = None
 
-        self.destroy()
+    def on_player_exit(self, *args):
+        # the media manager rebinds the menu to the next player, if any
+        self.bind(None)
+
+    def on_visibility_changed(self, *args):
+        if self.get_visible():
+            if self.timeout_id is None:
+                self.update_scale()
+                self.timeout_id = GLib.timeout_add(TICK_INTERVAL, self.update_scale)
+        else:
+            self.stop_ticking()
+
+    def stop_ticking(self):
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
 
     def update_ui(self):
         self.on_playback_status_changed()
@@ -164,10 +243,18 @@ class MediaPlayerMenu(PopOverWindow):
         self.track_artist_label.set_label(self.media_player.track_artist)
 
     def on_album_image_url_changed(self, *args):
-        self.song_image.set_from_pixbuf(
-            load_image_from_url(self.media_player.album_image_url)
+        url = self.media_player.album_image_url
+        album_art.load(
+            url,
+            ALBUM_IMAGE_SIZE,
+            lambda pixbuf: self.on_album_image_loaded(url, pixbuf),
         )
 
+    def on_album_image_loaded(self, url, pixbuf):
+        # the track may have changed while the art was loading
+        if self.media_player and self.media_player.album_image_url == url:
+            self.song_image.set_from_pixbuf(pixbuf)
+
     def on_track_position_changed(self, *args):
         self.track_scale.set_value(self.media_player.get_position())
         self.track_position_label.set_label(
@@ -203,13 +290,15 @@ class MediaPlayerMenu(PopOverWindow):
     def update_scale(self):
         """Update the scale position if the player is active."""
         if not self.media_player:
+            self.timeout_id = None
             return False
 
         if not self.user_interacting:
             if self.media_player.status == "playing":
-                self.track_scale.set_value(self.media_player.get_position())
+                position = self.media_player.get_position()
+                self.track_scale.set_value(position)
                 self.track_position_label.set_label(
-                    convert_ms(self.media_player.get_position()) or "0:00"
+                    convert_ms(position) or "0:00"
                 )
 
         return True
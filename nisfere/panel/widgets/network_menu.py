@@ -1,6 +1,3 @@
-import time
-from gi.repository import GLib
-
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.image import Image
@@ -19,7 +16,12 @@ from utils.icons import (
     download as download_icon,
     upload as upload_icon
 )
-from services import Wifi, network_manager_service, Ethernet, AccessPoint
+from services import Wifi, network_manager_service, network_rates_service, Ethernet, AccessPoint
+
+
+def format_speed(rx: float, tx: float) -> str:
+    """Format bytes per second received and sent as Mbps."""
+    return f"{download_icon} {rx * 8 / 1_000_000:.2f} Mbps | {upload_icon} {tx * 8 / 1_000_000:.2f} Mbps"
 
 
 class NetworkMenu(Box):
@@ -125,10 +127,8 @@ class EthernetBox(Box):
             self.header,
             self.inner
         ]
-        self.previous_rx, self.previous_tx = self.device.get_network_stats()
-        self.previous_time = time.time()
-        # Update every 1 second
-        GLib.timeout_add(1000, self.update_speed_display)
+        # only sampled while the menu is open
+        network_rates_service.watch(self.device.iface, self, self.update_speed_display)
         self.update_ui()
 
     def update_ui(self, *args):
@@ -137,28 +137,8 @@ class EthernetBox(Box):
                 self.device.icon_name, icon_size=30)
             self.status.set_label(self.device.internet.capitalize())
 
-    def update_speed_display(self):
-        current_rx, current_tx = self.device.get_network_stats()
-        current_time = time.time()
-        time_diff = current_time - self.previous_time
-
-        if time_diff == 0:
-            return True
-
-        # Calculate speeds in Mbps using correct formula
-        download_speed_mbps = (
-            (current_rx - self.previous_rx) * 8) / (time_diff * 1_000_000)
-        upload_speed_mbps = ((current_tx - self.previous_tx)
-                             * 8) / (time_diff * 1_000_000)
-
-        self.speed.set_label(
-            f"{download_icon} {download_speed_mbps:.2f} Mbps | {upload_icon} {upload_speed_mbps:.2f} Mbps")
-
-        # Update previous values
-        self.previous_rx, self.previous_tx = current_rx, current_tx
-        self.previous_time = current_time
-
-        return True  # Continue the timeout
+    def update_speed_display(self, rx: float, tx: float):
+        self.speed.set_label(format_speed(rx, tx))
 
 
 class WifiBox(Box):
@@ -179,12 +159,13 @@ class WifiBox(Box):
 
         self.device = device.build()\
             .connect('notify::wireless-enabled', self.update_header)\
-            .connect('ap-added', lambda _,
-                     ap: self.add_access_point(ap=ap))\
-            .connect('ap-removed', lambda _,
-                     ap: self.remove_access_point(ap=ap))\
+            .connect('notify::active-access-point', self.update_speed_visibility)\
+            .connect('networks-changed', lambda _,
+                     diff: self.on_networks_changed(diff=diff))\
             .unwrap()
 
+        self.rows: dict[str, AccessPointBox] = {}  # by ssid
+
         self.header_label = Label(
             name="wifi-menu-header", label="Wi-Fi", h_align="start")
 
@@ -221,6 +202,8 @@ class WifiBox(Box):
             ]
         )
 
+        self.speed = Label(name="wifi-menu-speed", h_align="start")
+
         self.networks = Box(name="wifi-menu-networks",
                             orientation="v", spacing=15)
 
@@ -233,10 +216,13 @@ class WifiBox(Box):
 
         self.children = [
             self.header,
+            self.speed,
             self.scrolled_window
         ]
 
+        network_rates_service.watch(self.device.iface, self, self.update_speed_display)
         self.update_header()
+        self.update_speed_visibility()
         self.update_networks()
 
     def update_header(self, *args):
@@ -251,24 +237,40 @@ class WifiBox(Box):
         else:
             self.header_buttons.children = self.toggle_button
             self.scrolled_window.set_visible(False)
+        self.update_speed_visibility()
+
+    def update_speed_visibility(self, *args):
+        self.speed.set_visible(
+            self.device.wireless_enabled and self.device.active_access_point is not None)
+
+    def update_speed_display(self, rx: float, tx: float):
+        self.speed.set_label(format_speed(rx, tx))
 
     def add_access_point(self, ap):
-        self.networks.add(
-            AccessPointBox(ap=ap, wifi_widget=self)
-        )
+        self.rows[ap.ssid] = AccessPointBox(ap=ap)
+        self.networks.add(self.rows[ap.ssid])
 
     def update_networks(self, *args):
-        self.networks.children = []
+        for row in self.rows.values():
+            row.destroy()
+        self.rows = {}
         for ap in self.device.access_points:
-            self.networks.add(
-                AccessPointBox(ap=ap, wifi_widget=self)
-            )
+            self.add_access_point(ap)
+
+    def remove_access_point(self, ssid):
+        if row := self.rows.pop(ssid, None):
+            row.destroy()
+
+    def on_networks_changed(self, diff):
+        for ssid in diff.removed:
+            self.remove_access_point(ssid)
+        for ap in diff.added:
+            self.add_access_point(ap)
+        for ap in diff.changed:
+            self.rows[ap.ssid].set_ap(ap)
 
-    def remove_access_point(self, ap):
-        for child in self.networks.get_children():
-            if child.ap == ap:  # Assuming AccessPointBox has an `ap` attribute
-                self.networks.remove(child)
-                break  # Exit loop after removing the correct one
+        for position, ap in enumerate(self.device.access_points):
+            self.networks.reorder_child(self.rows[ap.ssid], position)
 
 
 class AccessPointBox(Box):
@@ -282,12 +284,13 @@ class AccessPointBox(Box):
 
         self.ap = ap
 
-        self.ap.connect("changed", self.on_changed)
+        self._changed_handler = self.ap.connect("changed", self.on_changed)
 
         self.icon = Image(icon_name=self.ap.icon, icon_size=16)
 
         self.connect_button = Button(
-            name="wifi-connect-button", label=connect_icon, h_expand=True, h_align="end", tooltip_text="Connect")
+            name="wifi-connect-button", label=connect_icon, h_expand=True, h_align="end", tooltip_text="Connect",
+            on_clicked=lambda *args: self.on_connect_clicked())
 
         self.update_connect_button()
 
@@ -308,22 +311,36 @@ class AccessPointBox(Box):
         if self.password_entry:
             self.add(self.password_entry)
 
+        self.connect("destroy", lambda *args: self.ap.disconnect(self._changed_handler))
+
+    def set_ap(self, ap: AccessPoint):
+        """Show `ap`, another access point of the same network."""
+        if ap is not self.ap:
+            self.ap.disconnect(self._changed_handler)
+            self.ap = ap
+            self._changed_handler = self.ap.connect("changed", self.on_changed)
+            if self.password_entry:
+                self.password_entry.ap = ap
+        self.on_changed()
+
     def update_connect_button(self):
         if self.ap.is_active:
             self.connect_button.set_label(disconnect_icon)
             self.connect_button.set_tooltip_text("Disconnect")
-            self.connect_button.connect(
-                "clicked", lambda *args: self.ap.device.disconnect_wifi())
         else:
             self.connect_button.set_label(connect_icon)
             if not self.ap.requires_password:
                 self.connect_button.set_tooltip_text("Connect")
-                self.connect_button.connect(
-                    "clicked", lambda *args: self.ap.device.connect_to_wifi(ap=self.ap))
             else:
                 self.connect_button.set_tooltip_text("Needs password")
-                self.connect_button.connect(
-                    "clicked", lambda *args: self.create_password_entry())
+
+    def on_connect_clicked(self):
+        if self.ap.is_active:
+            self.ap.device.disconnect_wifi()
+        elif not self.ap.requires_password:
+            self.ap.device.connect_to_wifi(ap=self.ap)
+        else:
+            self.create_password_entry()
 
     def create_password_entry(self):
         if self.password_entry:
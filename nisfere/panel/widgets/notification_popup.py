@@ -1,4 +1,5 @@
-from gi.repository import GdkPixbuf
+import weakref
+from gi.repository import GdkPixbuf, GLib
 
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
@@ -6,11 +7,39 @@ from fabric.widgets.image import Image
 from fabric.utils.helpers import truncate, invoke_repeater
 from services import CachedNotification, Notification
 from utils.icons import close as close_icon
+from utils.blob_store import pixbuf_digest
+from utils.pixbuf_cache import pixbuf_cache
 from shared import Button
 
 NOTIFICATION_IMAGE_SIZE = 60
 NOTIFICATION_TIMEOUT = 10 * 1000  # 10 seconds
 
+# pixel digest of each live notification's image, hashed once per notification
+_pixmap_keys: "weakref.WeakKeyDictionary[Notification, str]" = weakref.WeakKeyDictionary()
+
+
+def has_image(notification: CachedNotification | Notification) -> bool:
+    if isinstance(notification, CachedNotification):
+        return notification.has_image
+    return bool(notification.image_pixmap or notification.image_file)
+
+
+def get_image(notification: CachedNotification | Notification, size: int) -> GdkPixbuf.Pixbuf | None:
+    """Return the notification image scaled to `size`, through the shared pixbuf cache."""
+    if isinstance(notification, CachedNotification) and notification.image_blob:
+        return pixbuf_cache.get(notification.image_blob, size, lambda: notification.image_pixbuf)
+    if notification.image_pixmap:
+        # keyed like the blob store, so the popup and the menu share an entry
+        if (key := _pixmap_keys.get(notification)) is None:
+            pixbuf = notification.image_pixmap.as_pixbuf()
+            key = _pixmap_keys[notification] = pixbuf_digest(pixbuf)
+            return pixbuf_cache.get(key, size, lambda: pixbuf)
+        return pixbuf_cache.get(key, size, lambda: notification.image_pixmap.as_pixbuf())
+    if notification.image_file:
+        return pixbuf_cache.get(
+            notification.image_file, size, lambda: GdkPixbuf.Pixbuf.new_from_file(notification.image_file))
+    return None
+
 
 class NotificationWidget(Box):
     def __init__(self, notification: CachedNotification | Notification, use_cache=False, **kwargs):
@@ -24,17 +53,18 @@ class NotificationWidget(Box):
 
         self.notification = notification
         self.use_cache = use_cache
+        self.count = 1
+        self._closed_handler = None
+        self._timeout_id = None
 
         if self.use_cache:
-            self.notification.connect(
+            self._closed_handler = self.notification.connect(
                 "removed-from-cache", lambda *args: self.close())
         else:
-            self.notification.connect("closed", lambda *args: self.close())
-            invoke_repeater(
-                NOTIFICATION_TIMEOUT,
-                lambda: self.notification.close("expired"),
-                initial_call=False,
-            )
+            self._closed_handler = self.notification.connect(
+                "closed", lambda *args: self.close())
+            self._timeout_id = invoke_repeater(
+                NOTIFICATION_TIMEOUT, self.on_timeout, initial_call=False)
 
         self.summary_label = Label(
             name="notification-popup-summary",
@@ -81,6 +111,12 @@ class NotificationWidget(Box):
                 )
             self.summary_box.add(actions_box)
 
+        self.count_label = Label(
+            name="notification-popup-count",
+            v_align="center",
+            visible=False,
+        )
+
         self.close_button = Button(
             name="notification-popup-close",
             label=close_icon,
@@ -96,26 +132,85 @@ class NotificationWidget(Box):
             name="notification-popup-inner"
         )
 
-        if self.notification.image_pixbuf:
-            self.notification_box.add(
-                Image(
-                    h_align="start",
-                    pixbuf=self.notification.image_pixbuf.scale_simple(
-                        NOTIFICATION_IMAGE_SIZE,
-                        NOTIFICATION_IMAGE_SIZE,
-                        GdkPixbuf.InterpType.BILINEAR,
-                    )
-                )
-            )
+        self.image = None
+        if has_image(self.notification):
+            self.add_image()
 
         self.notification_box.add(self.summary_box)
 
+        self.notification_box.add(self.count_label)
         self.notification_box.add(self.close_button)
 
         self.add(
             self.notification_box
         )
 
+        self.connect("destroy", self.on_destroy)
+
+    def add_image(self):
+        # decode the image only once the widget is actually realized
+        self.image = Image(
+            h_align="start",
+            size=NOTIFICATION_IMAGE_SIZE,
+        )
+        self.image.connect("realize", self.on_image_realize)
+        self.notification_box.add(self.image)
+        self.notification_box.reorder_child(self.image, 0)
+
+    def on_image_realize(self, *_):
+        self.image.disconnect_by_func(self.on_image_realize)
+        self.update_image()
+
+    def update_image(self):
+        if pixbuf := get_image(self.notification, NOTIFICATION_IMAGE_SIZE):
+            self.image.set_from_pixbuf(pixbuf)
+        else:
+            self.image.clear()
+
+    def on_timeout(self):
+        self._timeout_id = None
+        self.notification.close("expired")
+
+    def stack(self, notification: Notification):
+        """Show `notification` in place of the current one and bump the counter.
+
+        The notification it replaces is closed as expired.
+        """
+        previous = self.notification
+        previous.disconnect(self._closed_handler)
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+
+        self.notification = notification
+        self.count += 1
+        self._closed_handler = self.notification.connect(
+            "closed", lambda *args: self.close())
+        self._timeout_id = invoke_repeater(
+            NOTIFICATION_TIMEOUT, self.on_timeout, initial_call=False)
+
+        self.summary_label.set_label(self.notification.summary)
+        self.body_label.set_label(truncate(self.notification.body, 32))
+        if self.image is None and has_image(self.notification):
+            self.add_image()
+            self.image.show()
+        elif self.image is not None:
+            self.image.set_visible(has_image(self.notification))
+            if self.image.get_realized():
+                self.update_image()
+        self.count_label.set_label(str(self.count))
+        self.count_label.set_visible(True)
+
+        previous.close("expired")
+
+    def on_destroy(self, *_):
+        # entries are rebuilt often in the menu, don't leave handlers behind
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
+        if self._closed_handler is not None:
+            self.notification.disconnect(self._closed_handler)
+            self._closed_handler = None
+
     def close(self):
         parent = self.get_parent()
         if parent:
@@ -1,25 +1,123 @@
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.scrolledwindow import ScrolledWindow
+from fabric.widgets.entry import Entry
 
-from services import notification_service
+from services import notification_service, CachedNotification
 from shared import Button
 from utils.icons import (
     trash as trash_icon,
     trash_empty as trash_empty_icon,
     toggle_off as toggle_off_icon,
-    toggle_on as toggle_on_icon
+    toggle_on as toggle_on_icon,
+    chevron_down as chevron_down_icon,
+    chevron_up as chevron_up_icon,
 )
 from widgets.notification_popup import NotificationWidget
 
+from gi.repository import GLib
+
+PAGE_SIZE = 20  # entries per "load more"
+CHUNK_SIZE = 5  # entries built per idle callback
+
+
+class NotificationGroup(Box):
+    """The notifications of one app, collapsed to the newest by default."""
+
+    def __init__(self, app_name: str, **kwargs):
+        super().__init__(name="notifications-group", orientation="v", spacing=8, **kwargs)
+
+        self.app_name = app_name
+        self.expanded = False
+
+        self.title_label = Label(
+            name="notifications-group-title",
+            label=app_name or "Unknown",
+            h_expand=True,
+            h_align="start",
+        )
+        self.count_label = Label(name="notifications-group-count")
+        self.expand_button = Button(
+            label=chevron_down_icon,
+            on_clicked=lambda *_: self.toggle(),
+        )
+
+        self.body = Box(orientation="v", spacing=8)
+
+        self.children = [
+            Box(
+                name="notifications-group-header",
+                orientation="h",
+                spacing=8,
+                children=[self.title_label, self.count_label, self.expand_button],
+            ),
+            self.body,
+        ]
+
+        self.refresh()
+
+    @property
+    def notifications(self) -> list[CachedNotification]:
+        return notification_service.get_by_app(self.app_name)
+
+    def toggle(self):
+        self.expanded = not self.expanded
+        self.expand_button.set_label(chevron_up_icon if self.expanded else chevron_down_icon)
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the entries: all of them when expanded, else the newest."""
+        for child in self.body.get_children():
+            child.destroy()
+        notifications = self.notifications
+        shown = notifications[::-1] if self.expanded else notifications[-1:]
+        for notification in shown:
+            self.body.add(NotificationWidget(notification=notification, use_cache=True))
+        self.update_header()
+
+    def add_notification(self, notification: CachedNotification):
+        if self.expanded:
+            widget = NotificationWidget(notification=notification, use_cache=True)
+            self.body.add(widget)
+            self.body.reorder_child(widget, 0)
+            self.update_header()
+        else:
+            self.refresh()
+
+    def remove_notification(self, notification: CachedNotification):
+        # the entry closes itself, a collapsed group then shows the next newest
+        if self.expanded:
+            self.update_header()
+        else:
+            self.refresh()
+
+    def update_header(self):
+        notifications = self.notifications
+        self.count_label.set_label(str(len(notifications)))
+        self.expand_button.set_visible(len(notifications) > 1)
+        context = self.title_label.get_style_context()
+        if any(not notification.read for notification in notifications):
+            context.add_class("unread")
+        else:
+            context.remove_class("unread")
+
 
 class NotificationsMenu(Box):
+    """The notification history, grouped by app and searchable.
+
+    Nothing is built until the menu is first shown. Entries are then built
+    newest first, a few per idle callback, one page at a time; older pages
+    are built on demand with the "load more" button. Searching goes through
+    the service's text index and lists the matches without grouping.
+    """
+
     def __init__(self, **kwargs):
         super().__init__(name="notifications-menu", orientation="v",
                          spacing=8, style_classes="menu", **kwargs)
 
         self.notifications = notification_service.build()\
             .connect("cached-notification-added", self.on_notification_added)\
+            .connect("cached-notification-removed", self.on_notification_removed)\
             .connect("clear-all", self.on_clear_all)\
             .connect("notify::count", self.on_count_changed)\
             .connect("notify::dont-disturb", self.on_dnd_changed)\
@@ -53,6 +151,14 @@ class NotificationsMenu(Box):
             ]
         )
 
+        self.search_entry = Entry(
+            name="notifications-menu-search",
+            style_classes="menu-inner",
+            placeholder="Search notifications...",
+            h_expand=True,
+            notify_text=lambda entry, *_: self.on_search_changed(entry.get_text()),
+        )
+
         self.notifications_box = Box(
             name="notifications-menu-body",
             orientation="v",
@@ -69,29 +175,136 @@ class NotificationsMenu(Box):
             visible=(self.notifications.count == 0)
         )
 
-        for notification in self.notifications.cached_notifications:
-            self.notifications_box.add(
-                NotificationWidget(notification=notification, use_cache=True)
-            )
+        self.load_more_button = Button(
+            label="Load more",
+            on_clicked=self.load_more,
+            h_align="center",
+            visible=False,
+        )
+
+        # the entries not built yet, oldest first; None until first shown.
+        # App names when grouped, notifications when searching.
+        self._backlog = None
+        self._groups: dict[str, NotificationGroup] = {}
+        self._query = ""
+        self._to_build = 0
+        self._build_id = None
 
         self.scrolled_window = ScrolledWindow(
             style_classes="menu-inner scrollbar",
             name="notifications-menu-scroll-bar",
             min_content_size=(300, 400),
             max_content_size=(350, 400),
-            child=self.notifications_box,
+            child=Box(
+                orientation="v",
+                spacing=8,
+                children=[self.notifications_box, self.load_more_button],
+            ),
             visible=(self.notifications.count > 0)
         )
 
         self.children = [
             self.header,
+            self.search_entry,
             self.not_found_label,
             self.scrolled_window
         ]
 
+        self.connect("map", self.on_map)
+        self.connect("unmap", self.on_unmap)
+
+    def on_map(self, *_):
+        if self._backlog is None:
+            self.reset()
+
+    def on_unmap(self, *_):
+        self.notifications.mark_all_read()
+        for group in self._groups.values():
+            group.update_header()
+
+    def on_search_changed(self, query: str):
+        self._query = query.strip()
+        if self._backlog is not None:
+            self.reset()
+
+    def reset(self):
+        """Drop the built entries and start over from the newest page."""
+        if self._build_id is not None:
+            GLib.source_remove(self._build_id)
+            self._build_id = None
+        for child in self.notifications_box.get_children():
+            child.destroy()
+        self._groups = {}
+        self._to_build = 0
+
+        if self._query:
+            self._backlog = self.notifications.search(self._query)
+        else:
+            self._backlog = self.notifications.app_names
+        self.update_placeholder()
+        self.load_more()
+
+    def load_more(self, *_):
+        self._to_build += PAGE_SIZE
+        if self._build_id is None:
+            self._build_id = GLib.idle_add(self.build_chunk)
+
+    def build_chunk(self):
+        built = 0
+        while self._to_build and self._backlog and built < CHUNK_SIZE:
+            if widget := self.build_entry(self._backlog.pop()):
+                self.notifications_box.add(widget)
+                self._to_build -= 1
+                built += 1
+
+        if self._to_build and self._backlog:
+            return True
+
+        self._to_build = 0
+        self._build_id = None
+        self.load_more_button.set_visible(bool(self._backlog))
+        return False
+
+    def build_entry(self, entry: str | CachedNotification):
+        if isinstance(entry, CachedNotification):
+            if self.notifications.get_cached_notification(entry.cache_id) is not entry:
+                return None  # removed while waiting
+            return NotificationWidget(notification=entry, use_cache=True)
+
+        if entry in self._groups or not self.notifications.get_by_app(entry):
+            return None
+        group = self._groups[entry] = NotificationGroup(entry)
+        return group
+
     def on_notification_added(self, _, notification):
-        self.notifications_box.add(NotificationWidget(
-            notification=notification, use_cache=True))
+        if self._backlog is None:
+            return  # picked up when the menu is first shown
+
+        if self._query:
+            if notification not in self.notifications.search(self._query):
+                return
+            widget = NotificationWidget(notification=notification, use_cache=True)
+        elif group := self._groups.get(notification.app_name):
+            group.add_notification(notification)
+            widget = group
+        else:
+            if notification.app_name in self._backlog:
+                self._backlog.remove(notification.app_name)
+            widget = self.build_entry(notification.app_name)
+
+        if widget.get_parent() is None:
+            self.notifications_box.add(widget)
+        self.notifications_box.reorder_child(widget, 0)
+        self.update_placeholder()
+
+    def on_notification_removed(self, _, notification):
+        if self._query or not (group := self._groups.get(notification.app_name)):
+            return
+        if group.notifications:
+            group.remove_notification(notification)
+        else:
+            del self._groups[notification.app_name]
+            group.destroy()
 
     def on_dnd_changed(self, *args):
         self.dnd_button.set_label(self.get_dnd_button_label(
@@ -102,10 +315,24 @@ class NotificationsMenu(Box):
             self.get_clear_button_label(self.notifications.count))
         self.clear_button.set_tooltip_text(
             self.get_clear_button_tooltip(self.notifications.count))
-        self.not_found_label.set_visible(self.notifications.count == 0)
-        self.scrolled_window.set_visible(self.notifications.count > 0)
+        self.update_placeholder()
+
+    def update_placeholder(self):
+        empty = self.notifications.count == 0 or (
+            bool(self._query) and self._backlog is not None
+            and not self._backlog and not self.notifications_box.get_children())
+        self.not_found_label.set_visible(empty)
+        self.scrolled_window.set_visible(not empty)
 
     def on_clear_all(self, *args):
+        if self._backlog is not None:
+            self._backlog = []
+        self._groups = {}
+        if self._build_id is not None:
+            GLib.source_remove(self._build_id)
+            self._build_id = None
+        self._to_build = 0
+        self.load_more_button.set_visible(False)
         for child in self.notifications_box:
             child.destroy()
         self.notifications_box.children = []
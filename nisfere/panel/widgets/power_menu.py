@@ -6,9 +6,8 @@ from fabric.core import Signal
 
 from shared import Button
 from utils.config import CONFIG
-from utils.helpers import get_current_uptime
-
-from fabricators.uptime_fabricator import uptime_fabricator
+from utils.helpers import get_current_uptime, format_uptime
+from services import system_metrics_service
 
 power_buttons = CONFIG.get('power-buttons')
 
@@ -19,16 +18,14 @@ class PowerMenu(Box):
     def __init__(self, **kwargs):
         super().__init__(name= "power-menu", style_classes= "menu", **kwargs)
 
-        uptime_fabricator.build()\
-            .connect("changed", lambda _, v: self.on_uptime_value_changed(v))\
-        .unwrap()
-
         self.header = Label(name= "power-menu-header", label= "Power", h_align= "start")
 
         self.inner= Box(name= "power-menu-body", spacing= 6, orientation= "h", size= 25)
 
         self.footer= Label(name= "power-menu-footer", label= f"{get_current_uptime()}", h_align= "start")
 
+        system_metrics_service.watch("uptime", self, self.on_uptime_value_changed)
+
         for index, power_button in enumerate(power_buttons):
 
             button= Button(label=power_button.get('icon'), tooltip_text= power_button.get('label'), h_expand= True)
@@ -55,4 +52,4 @@ class PowerMenu(Box):
         self.emit("closed")
 
     def on_uptime_value_changed(self, uptime_value):
-        self.footer.set_label(uptime_value)
\ No newline at end of file
+        self.footer.set_label(format_uptime(uptime_value))
\ No newline at end of file